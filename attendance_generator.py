@@ -0,0 +1,91 @@
+from datetime import timedelta
+from operator import add
+
+import numpy as np
+from tqdm import tqdm
+
+# Same categories and weights the generators pass to random.choices()
+ATTENDANCE_STATUSES = ['Present', 'Absent', 'Half Day', 'Leave']
+ATTENDANCE_WEIGHTS = [70, 10, 40, 40]
+
+
+def draw_attendance_codes(rng, num_employees):
+    # One batched draw per day: index into ATTENDANCE_STATUSES for every employee.
+    # Mirrors random.choices(): bisect a uniform sample over the cumulative weights.
+    cum_weights = np.cumsum(ATTENDANCE_WEIGHTS)
+    samples = rng.random(num_employees) * cum_weights[-1]
+    return np.searchsorted(cum_weights, samples, side='right')
+
+
+def write_attendance_rows(f, emp_ids, start_date, end_date, rng=None, batch_size=None,
+                          desc="Generating SQL Scripts for Attendance Records Details...", progress=True,
+                          row_format='sql'):
+    """
+    Write attendance rows for every employee and every day between start_date and end_date.
+
+    batch_size=None emits one INSERT per row (main.py / script_2.py layout);
+    a number emits multi-row INSERTs of that many rows (script_5.py layout).
+    row_format='tsv' writes bare "empID<TAB>date<TAB>status" lines for LOAD DATA instead.
+    Returns the number of rows written.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    emp_ids = list(emp_ids)
+    total_days = (end_date - start_date).days + 1
+
+    # The empID part of every row never changes, so build it once.
+    if row_format == 'tsv':
+        batch_size = None
+        prefixes = [f"{emp_id}\t" for emp_id in emp_ids]
+        separator, row_end = "\t", "\n"
+    elif batch_size is None:
+        prefixes = [f"INSERT INTO attendance (empID, date, status) VALUES ({emp_id}, '" for emp_id in emp_ids]
+        separator, row_end = "', '", "');\n"
+    else:
+        prefixes = [f"({emp_id}, '" for emp_id in emp_ids]
+        separator, row_end = "', '", "')"
+
+    pending = []
+    rows_written = 0
+    current_date = start_date
+    for _ in tqdm(range(total_days), desc=desc, disable=not progress):
+        # Four possible tails for today, picked per employee by fancy indexing
+        suffixes = np.array([f"{current_date}{separator}{status}{row_end}" for status in ATTENDANCE_STATUSES],
+                            dtype=object)
+        rows = list(map(add, prefixes, suffixes[draw_attendance_codes(rng, len(emp_ids))]))
+        rows_written += len(rows)
+
+        if batch_size is None:
+            f.write("".join(rows))
+        else:
+            pending.extend(rows)
+            full = len(pending) - len(pending) % batch_size
+            for start in range(0, full, batch_size):
+                _write_attendance_batch(f, pending[start:start + batch_size])
+            del pending[:full]
+        current_date += timedelta(days=1)
+
+    if pending:
+        _write_attendance_batch(f, pending)
+    return rows_written
+
+
+def attendance_batches(emp_ids, start_date, end_date, rng=None):
+    """
+    Yield one list of (empID, date, status) tuples per day, for sinks that take rows
+    rather than text. Same draws as write_attendance_rows() for the same rng.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    emp_ids = list(emp_ids)
+    current_date = start_date
+    while current_date <= end_date:
+        statuses = [ATTENDANCE_STATUSES[code] for code in draw_attendance_codes(rng, len(emp_ids))]
+        yield [(emp_id, current_date, status) for emp_id, status in zip(emp_ids, statuses)]
+        current_date += timedelta(days=1)
+
+
+def _write_attendance_batch(f, values_list):
+    f.write("INSERT INTO attendance (empID, date, status) VALUES\n")
+    f.write(",\n".join(values_list) + ";\n")
@@ -0,0 +1,371 @@
+import json
+import multiprocessing
+import os
+import platform
+import re
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import mysql.connector
+from openpyxl import Workbook
+from sqlalchemy import create_engine
+
+from instrumentation import start_run, finish_run
+
+# psutil is optional: without it peak RSS falls back to resource.getrusage (Unix only)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Terminal colors
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+# Scales: attendance_days counts from parallel_generation.ATTENDANCE_START (None = the full range)
+BENCH_SCALES = {
+    'ci': {'num_employees': 200, 'num_projects': 1000, 'attendance_days': 31},
+    'small': {'num_employees': 1000, 'num_projects': 25000, 'attendance_days': 365},
+    'medium': {'num_employees': 5000, 'num_projects': 12000, 'attendance_days': 365},
+    'full': {'num_employees': 10000, 'num_projects': 50000, 'attendance_days': None},
+}
+BENCH_RUN_SCALES = ['ci']
+
+# Generator layouts (parallel_generation.PROFILES): batch_size and payroll year, scale from BENCH_SCALES
+BENCH_LAYOUTS = ['main', 'script_5']
+
+# 'sqlite' = file database next to the results, no server needed (CI);
+# 'mysql'  = MySQL/MariaDB from db_config.config_no_db, database BENCH_DATABASE (dropped first!)
+BENCH_BACKEND = 'sqlite'
+BENCH_DATABASE = 'company_db_bench'
+
+BENCH_STAGES = ['generate', 'load', 'csv_export', 'excel_export', 'csv_to_excel']
+BENCH_COMPRESSION = None   # None, 'gzip' or 'zstd' for the generated dump
+BENCH_WORKERS = os.cpu_count()
+BENCH_DIR = 'bench_runs'
+
+# How often the RSS sampler looks at the stage process and its children
+RSS_SAMPLE_SECONDS = 0.05
+
+
+class ResourceMeter:
+    """
+    Wall time, CPU time (user + system, children included) and peak RSS of this process.
+
+    Peak RSS is sampled with psutil over the process and its children (generation and
+    export workers), so it is the highest combined resident size seen.
+    """
+
+    def __init__(self):
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._times = os.times()
+        self._started = time.perf_counter()
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            try:
+                rss = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    try:
+                        rss += child.memory_info().rss
+                    except psutil.Error:
+                        pass
+                self.peak_rss = max(self.peak_rss, rss)
+            except psutil.Error:
+                pass
+            self._stop.wait(RSS_SAMPLE_SECONDS)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._started
+        times = os.times()
+        self.cpu = sum(times[:4]) - sum(self._times[:4])
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+        else:
+            import resource
+            # ru_maxrss is in KB on Linux
+            self.peak_rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * 1024
+
+    def metrics(self, rows=0, nbytes=0):
+        wall = max(self.wall, 1e-9)
+        return {'wall_s': round(self.wall, 4), 'cpu_s': round(self.cpu, 4),
+                'rows': rows, 'rows_per_s': round(rows / wall, 1),
+                'bytes': nbytes, 'bytes_per_s': round(nbytes / wall, 1),
+                'peak_rss_mb': round(self.peak_rss / 1e6, 1)}
+
+
+# --- SQLite stand-in -------------------------------------------------------------------------
+
+SQLITE_SKIP = re.compile(r'(CREATE\s+DATABASE|USE|SET|START\s+TRANSACTION|COMMIT)\b', re.IGNORECASE)
+SQLITE_AUTO_INCREMENT = re.compile(r'INT\s+PRIMARY\s+KEY\s+AUTO_INCREMENT', re.IGNORECASE)
+SQLITE_ENUM = re.compile(r"ENUM\s*\([^)]*\)", re.IGNORECASE)
+
+
+class SQLiteCursor:
+    """
+    Just enough of a mysql.connector cursor for run_sql_script_with_progress() on SQLite.
+
+    Statements the generated dump needs only on MySQL (CREATE DATABASE, USE, SET, the
+    transaction markers) are skipped, AUTO_INCREMENT and ENUM are rewritten, and SQLite
+    errors come back as mysql.connector.Error so the loader reports and skips them as usual.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.rowcount = -1
+
+    def execute(self, stmt):
+        stmt = stmt.strip().rstrip(';')
+        self.rowcount = -1
+        if SQLITE_SKIP.match(stmt):
+            return
+        if stmt[:6].upper() == 'CREATE':
+            stmt = SQLITE_ENUM.sub('TEXT', SQLITE_AUTO_INCREMENT.sub('INTEGER PRIMARY KEY AUTOINCREMENT', stmt))
+        try:
+            self.cursor.execute(stmt)
+            self.rowcount = self.cursor.rowcount
+        except sqlite3.Error as err:
+            raise mysql.connector.Error(msg=str(err)) from err
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+
+def sqlite_path(run_dir, layout):
+    return os.path.join(run_dir, f"{layout}.sqlite")
+
+
+def bench_engine(run_dir, layout):
+    if BENCH_BACKEND == 'sqlite':
+        return create_engine(f"sqlite:///{sqlite_path(run_dir, layout)}")
+    from db_config import config_no_db
+    return create_engine(f"mysql+pymysql://{config_no_db['user']}:{config_no_db['password']}"
+                         f"@{config_no_db['host']}/{BENCH_DATABASE}")
+
+
+# --- Stages ----------------------------------------------------------------------------------
+# Each returns {'tables': {table: {'rows', 'bytes'}}, 'rows', 'bytes'}; timing is done around it.
+
+def _dump_path(run_dir, layout):
+    from dump_writer import compressed_path
+    return compressed_path(os.path.join(run_dir, f"{layout}.sql"), BENCH_COMPRESSION)
+
+
+def stage_generate(run_dir, layout, scale):
+    import parallel_generation as pg
+    from table_specs import TABLE_DDL
+    profile = pg.PROFILES[layout]
+    if scale['attendance_days'] is not None:
+        pg.ATTENDANCE_END = pg.ATTENDANCE_START + timedelta(days=scale['attendance_days'] - 1)
+    pg.DATABASE_NAME = BENCH_DATABASE
+    stats = {}
+    pg.generate_parallel_dump(_dump_path(run_dir, layout), scale['num_employees'], scale['num_projects'],
+                              master_seed=42, workers=BENCH_WORKERS, payroll_year=profile['payroll_year'],
+                              batch_size=profile['batch_size'], compression=BENCH_COMPRESSION, stats=stats)
+    return {'tables': {table: stats[table] for table in TABLE_DDL if table in stats},
+            'bytes': os.path.getsize(_dump_path(run_dir, layout))}
+
+
+def stage_load(run_dir, layout, scale):
+    from db_config import config_no_db
+    from script_for_sql_loading import run_sql_script_with_progress
+    from table_specs import TABLE_DDL
+    dump = _dump_path(run_dir, layout)
+    if BENCH_BACKEND == 'sqlite':
+        if os.path.exists(sqlite_path(run_dir, layout)):
+            os.remove(sqlite_path(run_dir, layout))
+        conn = sqlite3.connect(sqlite_path(run_dir, layout))
+        cursor = SQLiteCursor(conn)
+    else:
+        conn = mysql.connector.connect(**config_no_db)
+        cursor = conn.cursor()
+        cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
+        cursor.execute(f"DROP DATABASE IF EXISTS `{BENCH_DATABASE}`;")
+    try:
+        run_sql_script_with_progress(cursor, dump, conn=conn, coalesce=True)
+        conn.commit()
+        tables = {}
+        for table in TABLE_DDL:
+            cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
+            tables[table] = {'rows': cursor.fetchone()[0], 'bytes': 0}
+    finally:
+        conn.close()
+    # Input bytes: the dump as read from disk (compressed if it is)
+    return {'tables': tables, 'bytes': os.path.getsize(dump)}
+
+
+def _per_table(run_dir, layout, work):
+    # Time each table on its own, on top of the stage total
+    from table_specs import TABLE_DDL
+    tables = {}
+    for table in TABLE_DDL:
+        with ResourceMeter() as meter:
+            rows, path = work(table)
+        nbytes = os.path.getsize(path) if path and os.path.exists(path) else 0
+        tables[table] = meter.metrics(rows, nbytes)
+    return {'tables': tables}
+
+
+def stage_csv_export(run_dir, layout, scale):
+    from script_to_CSV_from_sql import export_table_to_csv
+    engine = bench_engine(run_dir, layout)
+    csv_dir = os.path.join(run_dir, f"{layout}_csv")
+    os.makedirs(csv_dir, exist_ok=True)
+
+    def work(table):
+        path = os.path.join(csv_dir, f"{table}.csv")
+        return export_table_to_csv(engine, table, output_path=path), path
+    try:
+        return _per_table(run_dir, layout, work)
+    finally:
+        engine.dispose()
+
+
+def stage_excel_export(run_dir, layout, scale):
+    from script_to_excel_from_sql import write_table_streaming
+    engine = bench_engine(run_dir, layout)
+    excel_dir = os.path.join(run_dir, f"{layout}_excel")
+    os.makedirs(excel_dir, exist_ok=True)
+
+    def work(table):
+        # One workbook per table so each table's bytes can be reported
+        path = os.path.join(excel_dir, f"{table}.xlsx")
+        workbook = Workbook(write_only=True)
+        sheets = write_table_streaming(workbook, engine, table, progress=False)
+        workbook.save(path)
+        return sum(rows for _, rows in sheets), path
+    try:
+        return _per_table(run_dir, layout, work)
+    finally:
+        engine.dispose()
+
+
+def stage_csv_to_excel(run_dir, layout, scale):
+    from script_from_csv_to_excel import iter_csv_chunks, write_chunks_to_sheets
+    csv_dir = os.path.join(run_dir, f"{layout}_csv")
+    excel_dir = os.path.join(run_dir, f"{layout}_csv_excel")
+    os.makedirs(excel_dir, exist_ok=True)
+
+    def work(table):
+        path = os.path.join(excel_dir, f"{table}.xlsx")
+        workbook = Workbook(write_only=True)
+        rows = write_chunks_to_sheets(iter_csv_chunks(os.path.join(csv_dir, f"{table}.csv"), table),
+                                      table[:31], workbook)
+        workbook.save(path)
+        return rows, path
+    return _per_table(run_dir, layout, work)
+
+
+STAGE_FUNCTIONS = {
+    'generate': stage_generate,
+    'load': stage_load,
+    'csv_export': stage_csv_export,
+    'excel_export': stage_excel_export,
+    'csv_to_excel': stage_csv_to_excel,
+}
+
+
+def _run_stage_process(stage, run_dir, layout, scale, results):
+    try:
+        with ResourceMeter() as meter:
+            outcome = STAGE_FUNCTIONS[stage](run_dir, layout, scale)
+        tables = outcome['tables']
+        rows = sum(t['rows'] for t in tables.values())
+        nbytes = outcome.get('bytes', sum(t['bytes'] for t in tables.values()))
+        results.put({**meter.metrics(rows, nbytes), 'tables': tables})
+    except Exception as err:
+        results.put({'error': f"{type(err).__name__}: {err}"})
+
+
+def run_stage(stage, run_dir, layout, scale):
+    """
+    Run one stage in a fresh process, so peak RSS and CPU time belong to that stage alone.
+    """
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_stage_process, args=(stage, run_dir, layout, scale, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_summary(stages):
+    print(f"\n{BLUE}{'scale':<8}{'layout':<10}{'stage':<14}{'wall s':>9}{'cpu s':>9}"
+          f"{'rows/s':>12}{'MB/s':>9}{'peak MB':>9}{RESET}")
+    for entry in stages:
+        if 'error' in entry:
+            print(f"{RED}{entry['scale']:<8}{entry['layout']:<10}{entry['stage']:<14} ❌ {entry['error']}{RESET}")
+            continue
+        print(f"{GREEN}{entry['scale']:<8}{entry['layout']:<10}{entry['stage']:<14}{entry['wall_s']:>9.2f}"
+              f"{entry['cpu_s']:>9.2f}{entry['rows_per_s']:>12,.0f}{entry['bytes_per_s'] / 1e6:>9.1f}"
+              f"{entry['peak_rss_mb']:>9.1f}{RESET}")
+
+
+def main():
+    commit = git_commit()
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    results = {
+        'commit': commit,
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'backend': BENCH_BACKEND,
+        'config': {'scales': {name: BENCH_SCALES[name] for name in BENCH_RUN_SCALES}, 'layouts': BENCH_LAYOUTS,
+                   'stages': BENCH_STAGES, 'compression': BENCH_COMPRESSION, 'workers': BENCH_WORKERS},
+        'stages': [],
+    }
+    # Every stage process inherits the run id, so their spans land in one run of pipeline_metrics.jsonl
+    start_run('benchmark', **results['config'])
+
+    for scale_name in BENCH_RUN_SCALES:
+        scale = BENCH_SCALES[scale_name]
+        for layout in BENCH_LAYOUTS:
+            run_dir = os.path.join(BENCH_DIR, f"{stamp}_{scale_name}")
+            os.makedirs(run_dir, exist_ok=True)
+            for stage in BENCH_STAGES:
+                print(f"{YELLOW}⏱️  {scale_name} / {layout} / {stage}...{RESET}")
+                result = run_stage(stage, run_dir, layout, scale)
+                results['stages'].append({'scale': scale_name, 'layout': layout, 'stage': stage, **result})
+                if 'error' in result:
+                    print(f"{RED}❌ {stage} failed: {result['error']}{RESET}")
+                    break  # later stages need this one's output
+
+    results_file = os.path.join(BENCH_DIR, f"results_{stamp}_{commit[:8]}.json")
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, default=str)
+    finish_run('benchmark')
+    print_summary(results['stages'])
+    print(f"\n{GREEN}✅ Results written to {results_file}{RESET}")
+
+
+if __name__ == "__main__":
+    main()
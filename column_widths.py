@@ -0,0 +1,98 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl.utils import get_column_letter
+from sqlalchemy import text
+
+# Rows looked at per string column. Spread evenly over the table (first and last row included),
+# so autofit cost no longer grows with the sheet size.
+AUTOFIT_SAMPLE_ROWS = 10000
+
+# Rendered widths of the fixed-format types
+DATE_WIDTH = 10       # 2024-01-31
+DATETIME_WIDTH = 19   # 2024-01-31 09:30:00
+BOOL_WIDTH = 5        # False
+
+# Widths already worked out per table, so every {table}_partN sheet reuses them
+_width_cache = {}
+
+
+def enum_lengths(engine, table):
+    # For ENUM columns MySQL reports the longest allowed value as CHARACTER_MAXIMUM_LENGTH
+    if engine.dialect.name not in ('mysql', 'mariadb'):
+        return {}  # e.g. the SQLite stand-in of benchmark.py: no ENUMs, no information_schema
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT COLUMN_NAME, CHARACTER_MAXIMUM_LENGTH FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND DATA_TYPE = 'enum'"
+        ), {'table': table}).fetchall()
+    return {name: int(length) for name, length in rows}
+
+
+def _sample(series, sample_rows):
+    if len(series) <= sample_rows:
+        return series
+    positions = np.linspace(0, len(series) - 1, sample_rows).astype(np.int64)
+    return series.iloc[positions]
+
+
+def _int_width(series):
+    if series.empty:
+        return 0
+    # Digit count of the extremes (sign included) instead of formatting every cell
+    return max(len(str(series.min())), len(str(series.max())))
+
+
+def _object_width(series, sample_rows):
+    sample = _sample(series.dropna(), sample_rows)
+    if sample.empty:
+        return 0
+    first = sample.iloc[0]
+    if isinstance(first, datetime):
+        return DATETIME_WIDTH
+    if isinstance(first, date):
+        return DATE_WIDTH
+    return int(sample.astype(str).str.len().max())
+
+
+def estimate_column_widths(df, enums=None, sample_rows=AUTOFIT_SAMPLE_ROWS):
+    """
+    Content width of every column of df, header included, without formatting every cell.
+
+    Dates and datetimes get fixed widths, integers the digit count of min/max,
+    ENUM columns the longest declared value (enums: {column: length}), and
+    everything else the longest string in an evenly spaced sample of sample_rows.
+    """
+    enums = enums or {}
+    widths = []
+    for col in df.columns:
+        series = df[col]
+        if col in enums:
+            width = enums[col]
+        elif pd.api.types.is_bool_dtype(series):
+            width = BOOL_WIDTH
+        elif pd.api.types.is_integer_dtype(series):
+            width = _int_width(series)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            width = DATETIME_WIDTH
+        else:
+            width = _object_width(series, sample_rows)
+        widths.append(max(width, len(str(col))))
+    return widths
+
+
+def table_column_widths(table, df, enums=None, sample_rows=AUTOFIT_SAMPLE_ROWS):
+    # Computed once per table; later parts of the same table hit the cache
+    widths = _width_cache.get(table)
+    if widths is None:
+        widths = _width_cache[table] = estimate_column_widths(df, enums, sample_rows)
+    return widths
+
+
+def apply_column_widths(worksheet, widths, padding=2, max_width=None):
+    for col_idx, width in enumerate(widths, 1):
+        width += padding
+        if max_width is not None:
+            width = min(width, max_width)
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = width
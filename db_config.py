@@ -0,0 +1,9 @@
+# MySQL connection settings shared by the loader, the generator's 'db' sink / delta extents
+# and the benchmark. Kept apart so importing them doesn't pull in a whole script.
+config_no_db = {
+    'user': 'root',
+    'password': '17111998',
+    'host': 'localhost',
+    'use_pure': True,
+    'autocommit': False
+}
@@ -0,0 +1,146 @@
+import gzip
+import os
+import queue
+import threading
+import time
+
+# zstandard is optional: only needed for compression='zstd'
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Text collected in memory before it is encoded once and written with one binary write
+DUMP_BUFFER_BYTES = 8 * 1024 * 1024
+
+# Chunks waiting for the compressor thread. Bounds memory when compression is slower than generation.
+COMPRESS_QUEUE_CHUNKS = 4
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+def compressed_path(path, compression):
+    # company_database_full.sql -> company_database_full.sql.gz / .sql.zst
+    suffix = COMPRESSION_SUFFIXES.get(compression, '')
+    return path if path.endswith(suffix) else path + suffix
+
+
+class DumpWriter:
+    """
+    Buffered binary writer for large text dumps.
+
+    write() only appends the str to a list; once DUMP_BUFFER_BYTES have piled up they are
+    joined, encoded in one go and written with one large binary write. With compression='gzip'
+    or 'zstd' the encoded chunks are handed to a background thread, so compression overlaps
+    generation (zlib and zstd release the GIL while they work).
+    Counts bytes and rows (add to .rows) for report().
+    """
+
+    def __init__(self, path, compression=None, buffer_bytes=DUMP_BUFFER_BYTES, level=None):
+        self.path = path
+        self.compression = compression
+        self.buffer_bytes = buffer_bytes
+        self.rows = 0
+        self.bytes_written = 0  # uncompressed
+        self.elapsed = None
+        self.closed = False
+        self._pieces = []
+        self._pending = 0
+        self._started = time.perf_counter()
+        self._raw = open(path, 'wb')
+        self._stream = self._open_stream(compression, level)
+        self._queue = None
+        self._thread = None
+        self._error = None
+        if compression:
+            self._queue = queue.Queue(maxsize=COMPRESS_QUEUE_CHUNKS)
+            self._thread = threading.Thread(target=self._compress_loop, name='dump-compressor', daemon=True)
+            self._thread.start()
+
+    def _open_stream(self, compression, level):
+        if compression is None:
+            return self._raw
+        if compression == 'gzip':
+            # mtime=0 keeps the .gz byte-identical between runs
+            return gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=level or GZIP_LEVEL, mtime=0)
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ImportError("compression='zstd' needs the zstandard package (pip install zstandard)")
+            return zstandard.ZstdCompressor(level=level or ZSTD_LEVEL).stream_writer(self._raw, closefd=False)
+        raise ValueError(f"Unknown compression: {compression!r}")
+
+    def write(self, text):
+        self._pieces.append(text)
+        self._pending += len(text)
+        if self._pending >= self.buffer_bytes:
+            self.flush()
+
+    def write_bytes(self, data):
+        # Already-encoded data (e.g. a shard file) goes out as is, after what is buffered
+        self.flush()
+        self._emit(data)
+
+    def flush(self):
+        if self._pieces:
+            data = ''.join(self._pieces).encode('utf-8')
+            self._pieces = []
+            self._pending = 0
+            self._emit(data)
+
+    def _emit(self, data):
+        self.bytes_written += len(data)
+        if self._queue is None:
+            self._stream.write(data)
+            return
+        if self._error:
+            raise self._error
+        self._queue.put(data)
+
+    def _compress_loop(self):
+        try:
+            while True:
+                data = self._queue.get()
+                if data is None:
+                    return
+                self._stream.write(data)
+        except Exception as err:
+            self._error = err
+            # Keep draining so the producer never blocks on a full queue
+            while self._queue.get() is not None:
+                pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.flush()
+        finally:
+            if self._thread:
+                self._queue.put(None)
+                self._thread.join()
+            if self._stream is not self._raw:
+                self._stream.close()  # gzip trailer / end of the zstd frame
+            self._raw.close()
+            self.elapsed = time.perf_counter() - self._started
+        if self._error:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def report(self):
+        """One line with size, speed and (when compressed) the ratio; call after close()."""
+        elapsed = max(self.elapsed or time.perf_counter() - self._started, 1e-9)
+        line = (f"💾 {self.path}: {self.bytes_written / 1e6:,.1f} MB in {elapsed:.1f}s "
+                f"({self.bytes_written / 1e6 / elapsed:,.1f} MB/s, {self.rows / elapsed:,.0f} rows/s")
+        if self.compression:
+            on_disk = os.path.getsize(self.path)
+            line += f", {on_disk / 1e6:,.1f} MB on disk, {self.bytes_written / max(on_disk, 1):.1f}x smaller"
+        return line + ")"
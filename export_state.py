@@ -0,0 +1,133 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from tqdm import tqdm
+
+# Terminal colors
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+
+def load_state(state_file):
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state, state_file):
+    # Write next to the old file and swap, so a crash never leaves a half-written state
+    tmp_file = state_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, state_file)
+
+
+def monotonic_key(engine, table):
+    # Single-column AUTO_INCREMENT primary key: new rows always get bigger ids
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_KEY = 'PRI' "
+            "AND EXTRA LIKE '%auto_increment%'"
+        ), {'table': table}).fetchall()
+    return rows[0][0] if len(rows) == 1 else None
+
+
+def table_checksum(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(text(f"CHECKSUM TABLE `{table}`")).fetchone()[1]
+
+
+class RowHashFilter:
+    """
+    Remembers a 64-bit hash of every exported row of a table without a monotonic key.
+
+    Called with a DataFrame chunk it returns a mask of the rows not seen in an
+    earlier run; save() stores the hashes of everything seen so far.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.seen = np.load(path) if os.path.exists(path) else np.empty(0, dtype=np.uint64)
+        self.new_hashes = []
+
+    def __call__(self, chunk):
+        # Hash the text form so the same row hashes the same whatever dtype pandas picked
+        hashes = pd.util.hash_pandas_object(chunk.astype(str), index=False).to_numpy()
+        self.new_hashes.append(hashes)
+        return ~np.isin(hashes, self.seen)
+
+    def save(self):
+        self.seen = np.unique(np.concatenate([self.seen] + self.new_hashes))
+        self.new_hashes = []
+        np.save(self.path, self.seen)
+
+
+def export_incremental(engine, tables, export_fn, state_file, extension):
+    """
+    Export only the rows added since the last run and append them to the existing outputs.
+
+    Tables with an AUTO_INCREMENT key keep a high-water mark (max id exported) and
+    read just `WHERE id > mark`. Other tables are skipped when CHECKSUM TABLE is
+    unchanged, and otherwise filtered against the stored row hashes.
+    Tables seen for the first time are exported in full. Updated or deleted rows are
+    not tracked: the generated data is append-only.
+    """
+    state = load_state(state_file)
+    hash_dir = os.path.splitext(state_file)[0] + '_hashes'
+
+    for table in tqdm(tables, desc="🔁 Incremental export", unit="table", colour="blue"):
+        entry = state.get(table, {})
+        if entry and not os.path.exists(f"{table}.{extension}"):
+            # Output deleted or moved: a delta alone would be incomplete, so start the table over
+            tqdm.write(f"{YELLOW}🔄 {table}: {table}.{extension} is missing, exporting it again in full{RESET}")
+            entry = {}
+        append = bool(entry)
+        key = monotonic_key(engine, table)
+
+        if key is not None:
+            with engine.connect() as conn:
+                high_water = conn.execute(text(f"SELECT MAX(`{key}`) FROM `{table}`")).scalar()
+            last = entry.get('high_water') if entry.get('key') == key else None
+            if last is not None and high_water is not None and high_water < last:
+                # Ids went backwards: the table was reloaded, so start its output over
+                tqdm.write(f"{YELLOW}🔄 {table}: table was reloaded, exporting it again in full{RESET}")
+                last = None
+            if high_water is None or (append and last == high_water):
+                tqdm.write(f"{BLUE}⏭️  {table}: no new rows{RESET}")
+                continue
+            append = append and last is not None
+            # Upper bound too, so rows inserted while we export are picked up next run, not half-counted
+            where = f"`{key}` > :last AND `{key}` <= :high_water" if append else f"`{key}` <= :high_water"
+            params = {'last': last, 'high_water': high_water} if append else {'high_water': high_water}
+            with engine.connect() as conn:
+                total_rows = conn.execute(text(f"SELECT COUNT(*) FROM `{table}` WHERE {where}"), params).scalar()
+            rows = export_fn(engine, table, total_rows=total_rows, append=append,
+                             query=f"SELECT * FROM `{table}` WHERE {where} ORDER BY `{key}`", params=params)
+            state[table] = {'key': key, 'high_water': high_water,
+                            'exported_rows': (entry.get('exported_rows', 0) if append else 0) + rows}
+        else:
+            checksum = table_checksum(engine, table)
+            if append and entry.get('checksum') == checksum:
+                tqdm.write(f"{BLUE}⏭️  {table}: unchanged{RESET}")
+                continue
+            os.makedirs(hash_dir, exist_ok=True)
+            hash_path = os.path.join(hash_dir, f"{table}.npy")
+            if not append and os.path.exists(hash_path):
+                os.remove(hash_path)
+            row_filter = RowHashFilter(hash_path)
+            rows = export_fn(engine, table, append=append, row_filter=row_filter)
+            row_filter.save()
+            state[table] = {'checksum': checksum,
+                            'exported_rows': (entry.get('exported_rows', 0) if append else 0) + rows}
+
+        # Saved after every table: an interrupted run only repeats the table it was on
+        save_state(state, state_file)
+        mode = "appended to" if append else "written to"
+        tqdm.write(f"{GREEN}✅ {table}: {rows} new rows {mode} {table}.{extension}{RESET}")
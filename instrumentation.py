@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# Every script appends its spans and events here, one JSON object per line
+METRICS_LOG = 'pipeline_metrics.jsonl'
+
+# Prometheus text format dump written by finish_run() (None = off), e.g. for a node_exporter textfile collector
+PROMETHEUS_FILE = None
+METRIC_PREFIX = 'hr_pipeline'
+
+# Counters every span carries (others can be added with count() as well)
+COUNTERS = ('rows', 'bytes', 'statements', 'errors', 'retries')
+
+# One id per pipeline run, inherited by worker processes through the environment
+RUN_ID = os.environ.setdefault('HR_PIPELINE_RUN', uuid.uuid4().hex[:12])
+
+_lock = threading.Lock()
+_log = None
+_log_pid = None
+_local = threading.local()
+
+
+def emit(event, **fields):
+    """Append one JSON line {ts, run, pid, event, ...} to METRICS_LOG."""
+    global _log, _log_pid
+    record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'run': RUN_ID, 'pid': os.getpid(),
+              'event': event, **fields}
+    line = json.dumps(record, default=str) + '\n'
+    with _lock:
+        # Each process opens its own handle; O_APPEND keeps lines from different processes whole
+        if _log is None or _log_pid != os.getpid():
+            _log = open(METRICS_LOG, 'a', encoding='utf-8', buffering=1)
+            _log_pid = os.getpid()
+        _log.write(line)
+
+
+class Span:
+    """
+    Timed section of a stage, optionally for one table: wall time, CPU time of the
+    calling thread and counters (rows, bytes, statements, errors, retries).
+
+    On exit one 'span' line is written with the totals and the rates. Work that is
+    interleaved across tables inside one span (the loader) can be broken down with
+    count(..., table=) and timed(table); it shows up under 'tables' in the same line.
+    """
+
+    def __init__(self, stage, table=None, **labels):
+        self.stage = stage
+        self.table = table
+        self.labels = labels
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.tables = {}
+        self.status = 'ok'
+        self.error = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._cpu = time.thread_time()
+        self._parent = getattr(_local, 'span', None)
+        _local.span = self
+        return self
+
+    def count(self, counter, n=1, table=None):
+        # A table span's own table needs no breakdown
+        counters = self.counters if table in (None, self.table) else self._table(table)
+        counters[counter] = counters.get(counter, 0) + n
+
+    def _table(self, table):
+        if table not in self.tables:
+            self.tables[table] = {**dict.fromkeys(COUNTERS, 0), 'wall_s': 0.0}
+        return self.tables[table]
+
+    def timed(self, table):
+        return _NullTimer() if table == self.table else _TableTimer(self, table)
+
+    def stop(self, error=None):
+        wall = time.perf_counter() - self._started
+        if getattr(_local, 'span', None) is self:
+            _local.span = self._parent
+        if error is not None:
+            self.status, self.error = 'error', f"{type(error).__name__}: {error}"
+        # Table counters add up into the span's own totals
+        for counters in self.tables.values():
+            for counter in COUNTERS:
+                self.counters[counter] += counters[counter]
+        fields = {'stage': self.stage, 'table': self.table, **self.labels, 'status': self.status,
+                  'wall_s': round(wall, 4), 'cpu_s': round(time.thread_time() - self._cpu, 4), **self.counters,
+                  'rows_per_s': round(self.counters['rows'] / max(wall, 1e-9), 1),
+                  'bytes_per_s': round(self.counters['bytes'] / max(wall, 1e-9), 1)}
+        if self.tables:
+            fields['tables'] = {table: {**counters, 'wall_s': round(counters['wall_s'], 4)}
+                                for table, counters in self.tables.items()}
+        if self.error:
+            fields['error'] = self.error
+        emit('span', **fields)
+        return wall
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop(exc)
+
+
+class _TableTimer:
+    def __init__(self, span, table):
+        self.span = span
+        self.table = table
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span._table(self.table)['wall_s'] += time.perf_counter() - self._started
+
+
+def span(stage, table=None, **labels):
+    """with span('csv_export', table='employees') as s: ... s.count('rows', n)"""
+    return Span(stage, table, **labels)
+
+
+def current_span():
+    # Innermost open span of this thread, or None
+    return getattr(_local, 'span', None)
+
+
+def count(counter, n=1, table=None):
+    """Add to the innermost open span of this thread; does nothing outside a span."""
+    active = current_span()
+    if active is not None:
+        active.count(counter, n, table)
+
+
+def timed(table):
+    """Add the time of the with-block to `table` in the innermost open span (no-op outside one)."""
+    active = current_span()
+    return active.timed(table) if active is not None else _NullTimer()
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+def read_run(run=RUN_ID, log_file=METRICS_LOG):
+    # All lines of one run, from every process that took part in it
+    if not os.path.exists(log_file):
+        return []
+    records = []
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if record.get('run') == run:
+                records.append(record)
+    return records
+
+
+def _labels(stage, table):
+    labels = {'stage': stage}
+    if table:
+        labels['table'] = table
+    # Label values escape backslash, double quote and newline
+    escape = lambda value: str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in labels.items())
+
+
+def prometheus_text(records):
+    """
+    Sum the spans of a run per (stage, table) into Prometheus counters:
+    {prefix}_seconds_total, {prefix}_spans_total and {prefix}_{counter}_total.
+    """
+    totals = {}
+    for record in records:
+        if record.get('event') != 'span':
+            continue
+        breakdown = record.get('tables') or {}
+        series = [(record['stage'], record.get('table'), record, 1)]
+        if not record.get('table'):
+            series += [(record['stage'], table, counters, 0) for table, counters in breakdown.items()]
+        for stage, table, values, spans in series:
+            entry = totals.setdefault((stage, table or ''), {'seconds': 0.0, 'spans': 0})
+            entry['seconds'] += values.get('wall_s', 0)
+            entry['spans'] += spans
+            for counter in COUNTERS:
+                entry[counter] = entry.get(counter, 0) + values.get(counter, 0)
+
+    lines = []
+    for metric in ('seconds', 'spans') + COUNTERS:
+        name = f"{METRIC_PREFIX}_{metric}_total"
+        lines.append(f"# TYPE {name} counter")
+        for (stage, table), entry in sorted(totals.items()):
+            # Seconds keep microseconds; row/byte counters are printed exactly (':g' would round them)
+            value = f"{entry[metric]:.6f}" if metric == 'seconds' else entry[metric]
+            lines.append(f"{name}{{{_labels(stage, table)}}} {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def start_run(script, **config):
+    # First line of a script's run: what ran and with which settings
+    emit('run_start', script=script, **config)
+
+
+def finish_run(script, prometheus_file=None):
+    """Write a 'run_end' line and, if prometheus_file (default PROMETHEUS_FILE) is set, the Prometheus dump."""
+    emit('run_end', script=script)
+    prometheus_file = prometheus_file or PROMETHEUS_FILE
+    if prometheus_file:
+        with open(prometheus_file, 'w', encoding='utf-8') as f:
+            f.write(prometheus_text(read_run()))
@@ -0,0 +1,561 @@
+import hashlib
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta, datetime
+from itertools import groupby
+from types import SimpleNamespace
+
+import mysql.connector
+import numpy as np
+from faker import Faker
+from tqdm import tqdm
+
+from value_pools import FakerPool, FAKER_POOL_SIZE
+from db_config import config_no_db
+from table_specs import TABLE_SPECS, TABLE_COLUMNS, ID_COLUMNS
+from dump_writer import compressed_path
+from sinks import SqlDumpSink, DelimitedSink, ParquetSink, DatabaseSink, SINK_BATCH_ROWS
+from instrumentation import span, start_run, finish_run
+from profiling import profiled, merge_worker_profiles, enable_profiling
+
+# Scale presets: main.py, script_2.py and script_5.py are these profiles run through the same table specs
+PROFILES = {
+    'main': {'num_employees': 1000, 'num_projects': 25000, 'payroll_year': 2020, 'batch_size': None},
+    'script_2': {'num_employees': 10000, 'num_projects': 50000, 'payroll_year': 2023, 'batch_size': None},
+    'script_5': {'num_employees': 5000, 'num_projects': 12000, 'payroll_year': 2023, 'batch_size': 1000},
+}
+
+# Parallel generation config
+PROFILE = 'script_2'
+# None draws a fresh seed per run; it is printed and recorded in MANIFEST_FILE so the dump can be rebuilt
+MASTER_SEED = 42
+WORKERS = os.cpu_count()
+OUTPUT_FILE = 'company_database_full.sql'
+# Where the rows go (sinks.py):
+#   'sql'      one INSERT dump, OUTPUT_FILE
+#   'tsv'      schema.sql + one TSV per table in BULK_DIR (LOAD DATA fast path)
+#   'csv'      schema.sql + one CSV per table in CSV_DIR, no database needed
+#   'parquet'  one Parquet dataset per table in PARQUET_DIR
+#   'db'       straight into MySQL (DATABASE_NAME), skipping the dump file and the loader
+OUTPUT_FORMAT = 'sql'
+BULK_DIR = 'bulk_dump'
+CSV_DIR = 'csv_dump'
+PARQUET_DIR = 'parquet_dump'
+# 'sql' only: None, 'gzip' (-> .sql.gz) or 'zstd' (-> .sql.zst), compressed in a background thread
+DUMP_COMPRESSION = None
+# Pinned "today" for relative date ranges ('-10y' .. 'today') so reruns are byte-identical
+REFERENCE_DATE = date(2025, 12, 31)
+
+# Shard sizes are fixed (not derived from WORKERS) so the dump does not depend on the pool size
+EMPLOYEES_PER_SHARD = 1000
+PROJECTS_PER_SHARD = 5000
+ATTENDANCE_DAYS_PER_SHARD = 31
+# Shard size per id space a table's rows hang off (see 'rows' in table_specs.py)
+SHARD_SIZES = {'employees': EMPLOYEES_PER_SHARD, 'projects': PROJECTS_PER_SHARD, 'days': ATTENDANCE_DAYS_PER_SHARD}
+
+ATTENDANCE_START = date(2020, 1, 1)
+ATTENDANCE_END = date(2025, 12, 31)
+
+# 'full' regenerates everything (and writes MANIFEST_FILE); 'delta' reads the current extents
+# and writes only new rows - new hires, new projects, more attendance days - to DELTA_OUTPUT_FILE;
+# 'table' rebuilds REGENERATE_TABLES of the full dump from MANIFEST_FILE and checks them against it
+GENERATION_MODE = 'full'
+MANIFEST_FILE = 'company_manifest.json'
+# 'manifest' = extents recorded by the generator, 'db' = MAX ids / last attendance day in MySQL
+EXTENTS_SOURCE = 'manifest'
+DATABASE_NAME = 'company_db'
+DELTA_NEW_EMPLOYEES = 1000
+DELTA_NEW_PROJECTS = 0
+DELTA_ATTENDANCE_DAYS = 30
+DELTA_OUTPUT_FILE = 'company_database_delta_{number:04d}.sql'
+REGENERATE_TABLES = ['payroll']
+REGENERATE_OUTPUT_FILE = 'company_database_regenerated.sql'
+
+
+def resolve_seed(master_seed):
+    # MASTER_SEED = None: draw a fresh seed, and say which one so the run can be repeated
+    if master_seed is None:
+        master_seed = random.SystemRandom().randrange(2 ** 63)
+        tqdm.write(f"🎲 No seed given, using master seed {master_seed} (recorded in the manifest)")
+    return master_seed
+
+
+def derive_seed(master_seed, table, shard_index):
+    # Stable across processes and Python versions (unlike hash())
+    digest = hashlib.sha256(f"{master_seed}:{table}:{shard_index}".encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+_worker_pools = None
+
+
+def shard_columns(table, params):
+    if params.get('explicit_ids') and table in ID_COLUMNS:
+        return [ID_COLUMNS[table]] + TABLE_COLUMNS[table]
+    return TABLE_COLUMNS[table]
+
+
+def _init_worker(pools):
+    # Runs once per pool process so the Faker pools are pickled per worker, not per shard
+    global _worker_pools
+    _worker_pools = pools
+
+
+def plan_table_shards(extents, include_lists=True, shard_sizes=None):
+    """
+    Split every table of TABLE_SPECS into (table, shard_index, lo, hi) work items, in dump order.
+
+    extents maps 'employees', 'projects' and 'days' (offsets from ATTENDANCE_START) to the
+    inclusive (first, last) range to generate. employees/projects and the per-employee tables
+    are split by id range, attendance by day range so the day-major row order survives
+    concatenation. include_lists=False leaves out fixed lists such as departments.
+    shard_sizes (default SHARD_SIZES) is what a manifest recorded, when rebuilding from one.
+    """
+    shard_sizes = shard_sizes or SHARD_SIZES
+    shards = []
+    for table, spec in TABLE_SPECS.items():
+        rows = spec['rows']
+        if rows['kind'] == 'list':
+            if include_lists:
+                shards.append((table, 0, 1, len(rows['values'])))
+            continue
+        source = 'days' if rows['kind'] == 'daily' else rows.get('of', 'employees')
+        first, last = extents[source]
+        size = shard_sizes[source]
+        for index, lo in enumerate(range(first, last + 1, size)):
+            shards.append((table, index, lo, min(lo + size - 1, last)))
+    return shards
+
+
+def plan_shards(num_employees, num_projects, attendance_start=None, attendance_end=None, shard_sizes=None):
+    total_days = ((attendance_end or ATTENDANCE_END) - (attendance_start or ATTENDANCE_START)).days + 1
+    return plan_table_shards({'employees': (1, num_employees), 'projects': (1, num_projects),
+                              'days': (0, total_days - 1)}, shard_sizes=shard_sizes)
+
+
+def spec_rows(table, lo, hi, rng, pool, params):
+    """
+    Yield every row of a shard as a tuple of column values, in dump order, by walking the
+    table's spec: one row per list entry / id, or per employee in lo..hi its 'count' rows
+    or one row per 'each' entry. Columns are drawn in declaration order from the shard's rng.
+    """
+    spec = TABLE_SPECS[table]
+    rows, columns = spec['rows'], spec['columns']
+    ctx = SimpleNamespace(rng=rng, pool=pool, params=params, parent=None, item=None, parent_values={})
+
+    def build():
+        row = {}
+        for name, value in columns:
+            row[name] = value(ctx, row)
+        return tuple(row.values())
+
+    if rows['kind'] == 'list':
+        for value in rows['values'][lo - 1:hi]:
+            ctx.item = value
+            yield build()
+    elif rows['kind'] == 'range':
+        for _ in range(lo, hi + 1):
+            yield build()
+    elif rows['kind'] == 'per_employee':
+        for emp_id in range(lo, hi + 1):
+            ctx.parent = emp_id
+            for name, value in rows.get('parent_values', {}).items():
+                ctx.parent_values[name] = value(ctx, None)
+            items = rows['each'](ctx, None) if 'each' in rows else range(rows['count'](ctx, None))
+            for item in items:
+                ctx.item = item
+                yield build()
+    else:
+        raise ValueError(f"{table}: rows of kind {rows['kind']!r} are not generated row by row")
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_shard(shard, params, sink):
+    """Process-pool worker: generate one shard into the sink's shard writer and return its result."""
+    table, index, lo, hi = shard
+    # One .prof per shard with --profile, merged per table by the parent afterwards
+    with profiled(f"generate.{table}.{index:05d}", worker=True):
+        return _generate_shard(table, index, lo, hi, params, sink)
+
+
+def _generate_shard(table, index, lo, hi, params, sink):
+    # Deltas get their own seed streams, so they never repeat rows of the base dump
+    seed_table = f"{table}@{params['seed_tag']}" if params.get('seed_tag') else table
+    seed = derive_seed(params['master_seed'], seed_table, index)
+    writer = sink.shard_writer(table, index, shard_columns(table, params))
+
+    if TABLE_SPECS[table]['rows']['kind'] == 'daily':
+        attendance_start = params.get('attendance_start', ATTENDANCE_START)
+        writer.write_attendance(range(1, params['num_employees'] + 1),
+                                attendance_start + timedelta(days=lo), attendance_start + timedelta(days=hi),
+                                rng=np.random.default_rng(seed))
+        return writer.close()
+
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    pool = FakerPool(fake, pool_size=params['faker_pool_size'], rng=np.random.default_rng(seed),
+                     today=params['reference_date'])
+    pool.pools = _worker_pools
+    rows = spec_rows(table, lo, hi, rng, pool, params)
+    if params.get('explicit_ids') and table in ID_COLUMNS:
+        rows = ((row_id,) + tuple(row) for row_id, row in zip(range(lo, hi + 1), rows))
+    for batch in _batches(rows, SINK_BATCH_ROWS):
+        writer.write_batch(batch)
+    return writer.close()
+
+
+def _faker_pools(master_seed, faker_pool_size):
+    # Built once in the parent and shared by every worker, so pool contents depend only on the seed
+    if not faker_pool_size:
+        return {}
+    fake = Faker()
+    fake.seed_instance(master_seed)
+    return FakerPool(fake, pool_size=faker_pool_size).pregenerate().pools
+
+
+def open_sink(output_format, output, batch_size=None, write_ddl=True, compression=None):
+    """
+    Sink for an OUTPUT_FORMAT: 'sql' and 'tsv'/'csv'/'parquet' write to the file or directory
+    `output`; 'db' inserts into the MySQL database named `output`.
+    write_ddl=False is used for delta dumps: no CREATE statements, only new rows.
+    """
+    if output_format == 'sql':
+        return SqlDumpSink(output, DATABASE_NAME, batch_size, write_ddl, compression)
+    if output_format in ('tsv', 'csv'):
+        return DelimitedSink(output, DATABASE_NAME, output_format, write_ddl)
+    if output_format == 'parquet':
+        return ParquetSink(output)
+    if output_format == 'db':
+        return DatabaseSink(output, write_ddl=write_ddl)
+    raise ValueError(f"Unknown output format: {output_format!r}")
+
+
+def _write_shards(sink, shards, params, workers, pools):
+    """
+    Run shards in a process pool and hand their results to the sink in plan order.
+
+    Records a 'generate' span per table (time from its first shard being awaited to its last
+    one being written, with the sink's row/byte counts) and one for the whole run.
+    """
+    if sink.explicit_ids:
+        params = dict(params, explicit_ids=True)
+    tables = list(dict.fromkeys(shard[0] for shard in shards))
+    try:
+        with span('generate', output_format=params['output_format'], shards=len(shards),
+                  delta=bool(params.get('seed_tag'))) as stage_span:
+            sink.start(tables)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pools,)) as executor, \
+                    tqdm(total=len(shards), desc="Generating shards") as progress:
+                futures = [executor.submit(generate_shard, shard, params, sink) for shard in shards]
+                for table, table_shards in groupby(zip(shards, futures), key=lambda item: item[0][0]):
+                    with span('generate', table=table) as table_span:
+                        sink.begin_table(table, shard_columns(table, params))
+                        for shard, future in table_shards:
+                            sink.add_shard(table, future.result())
+                            progress.update(1)
+                        sink.end_table(table)
+                        table_stats = sink.table_stats.get(table, {})
+                        table_stats['shards'] = sum(1 for shard in shards if shard[0] == table)
+                        table_stats['sha256'] = sink.checksums().get(table)
+                        table_span.count('rows', table_stats.get('rows', 0))
+                        table_span.count('bytes', table_stats.get('bytes', 0))
+            sink.finish()
+            merge_worker_profiles('generate')
+            for table_stats in sink.table_stats.values():
+                stage_span.count('rows', table_stats['rows'])
+                stage_span.count('bytes', table_stats['bytes'])
+    finally:
+        sink.close()
+    return len(shards)
+
+
+def generate_parallel_dump(output_file, num_employees, num_projects, master_seed, workers=None,
+                           payroll_year=2020, batch_size=None, reference_date=REFERENCE_DATE,
+                           faker_pool_size=FAKER_POOL_SIZE, output_format='sql', manifest_file=None,
+                           compression=None, stats=None):
+    """
+    Generate the full company dump with every table split into shards that run in a process pool.
+
+    Shards are appended to the output in plan order as soon as they (and every shard before them)
+    are done, so the same master_seed always gives a byte-identical file regardless of worker count.
+
+    output_format='sql' writes one INSERT dump to output_file. 'tsv' and 'csv' treat output_file
+    as a directory and write schema.sql (DDL only) plus one {table}.tsv / {table}.csv per table,
+    with a header line of column names ('tsv' is script_for_sql_loading.py's bulk mode).
+    'parquet' writes {table}.parquet datasets into the directory output_file, and 'db' inserts
+    straight into the MySQL database named output_file (see sinks.py). compression ('gzip' /
+    'zstd', 'sql' only) adds .gz / .zst to output_file and compresses while generating.
+    manifest_file records the seed, extents, shard sizes and per-table row counts and sha256
+    checksums, so generate_delta() can continue from it and regenerate_tables() can rebuild
+    any table on its own. master_seed=None draws a fresh seed (recorded in the manifest).
+    stats, if given, is filled with {table: {'rows', 'bytes', 'shards', 'sha256'}}.
+    """
+    master_seed = resolve_seed(master_seed)
+    params = {
+        'num_employees': num_employees,
+        'num_projects': num_projects,
+        'master_seed': master_seed,
+        'batch_size': batch_size,
+        'reference_date': reference_date,
+        'months': [datetime(payroll_year, m, 1).strftime('%B %Y') for m in range(1, 13)],
+        'faker_pool_size': faker_pool_size,
+        'output_format': output_format,
+    }
+    if output_format == 'sql' and compression:
+        output_file = compressed_path(output_file, compression)
+    shards = plan_shards(num_employees, num_projects)
+    sink = open_sink(output_format, output_file, batch_size, compression=compression)
+    shard_count = _write_shards(sink, shards, params, workers, _faker_pools(master_seed, faker_pool_size))
+    if stats is not None:
+        stats.update(sink.table_stats)
+
+    if manifest_file:
+        save_manifest(manifest_file, {
+            'master_seed': master_seed,
+            'num_employees': num_employees,
+            'num_projects': num_projects,
+            'attendance_start': ATTENDANCE_START.isoformat(),
+            'attendance_end': ATTENDANCE_END.isoformat(),
+            'months': params['months'],
+            'reference_date': reference_date.isoformat(),
+            'batch_size': batch_size,
+            'faker_pool_size': faker_pool_size,
+            'output_format': output_format,
+            'compression': compression,
+            'shard_sizes': SHARD_SIZES,
+            # How every shard's Faker / random / numpy streams are seeded (see derive_seed)
+            'seed_scheme': 'sha256("{master_seed}:{table}:{shard_index}")[:8], big-endian',
+            # sha256 over each table's row bytes ('sql' / 'tsv' / 'csv'; null for 'parquet' / 'db')
+            'tables': sink.table_stats,
+            'dumps': [{'file': output_file, 'generated_at': datetime.now().isoformat(timespec='seconds'),
+                       'num_employees': num_employees, 'num_projects': num_projects,
+                       'attendance_end': ATTENDANCE_END.isoformat()}],
+        })
+    return shard_count
+
+
+def generate_profile(profile, output_file=OUTPUT_FILE, workers=WORKERS, master_seed=MASTER_SEED,
+                     output_format='sql', manifest_file=None, compression=None):
+    # One named scale preset from PROFILES through the table-spec engine
+    preset = PROFILES[profile]
+    return generate_parallel_dump(output_file, preset['num_employees'], preset['num_projects'], master_seed,
+                                  workers=workers, payroll_year=preset['payroll_year'],
+                                  batch_size=preset['batch_size'], output_format=output_format,
+                                  manifest_file=manifest_file, compression=compression)
+
+
+def load_manifest(manifest_file):
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_file, manifest):
+    tmp_file = manifest_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_file, manifest_file)
+
+
+def extents_from_db(database=DATABASE_NAME):
+    # What is actually loaded: ids are generated from 1 without gaps, so MAX(id) is the count
+    conn = mysql.connector.connect(**config_no_db, database=database)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(empID) FROM employees")
+        num_employees = cursor.fetchone()[0] or 0
+        cursor.execute("SELECT MAX(project_id) FROM projects")
+        num_projects = cursor.fetchone()[0] or 0
+        cursor.execute("SELECT MAX(date) FROM attendance")
+        attendance_end = cursor.fetchone()[0] or ATTENDANCE_START - timedelta(days=1)
+        cursor.close()
+    finally:
+        conn.close()
+    return {'num_employees': num_employees, 'num_projects': num_projects,
+            'attendance_end': attendance_end.isoformat()}
+
+
+def plan_delta_shards(num_employees, num_projects, new_employees, new_projects, attendance_end, new_days):
+    """
+    Work items for a delta, in dump order: new hires and projects with their per-employee
+    tables (ids continuing after the current maximum), then attendance of every employee
+    for the next new_days days. Attendance shards use day offsets from ATTENDANCE_START.
+    """
+    first_day = (attendance_end - ATTENDANCE_START).days + 1
+    return plan_table_shards({'employees': (num_employees + 1, num_employees + new_employees),
+                              'projects': (num_projects + 1, num_projects + new_projects),
+                              'days': (first_day, first_day + new_days - 1)}, include_lists=False)
+
+
+def generate_delta(manifest_file, new_employees=0, new_projects=0, new_days=0, workers=None,
+                   extents_source='manifest', output_file=None, output_format=None):
+    """
+    Write only the rows needed to grow an existing dataset, then update the manifest.
+
+    Seed, payroll months and pool settings come from the manifest written by
+    generate_parallel_dump(); the current extents come from it too, or from the
+    database with extents_source='db'. Employee and project ids are written
+    explicitly, so the delta lines up with what is loaded. Returns (output_file, shard count).
+    """
+    manifest = load_manifest(manifest_file)
+    extents = dict(manifest)
+    if extents_source == 'db':
+        extents.update(extents_from_db())
+    num_employees, num_projects = extents['num_employees'], extents['num_projects']
+    attendance_end = date.fromisoformat(extents['attendance_end'])
+    new_attendance_end = attendance_end + timedelta(days=new_days)
+
+    delta_number = len(manifest['dumps'])
+    output_format = output_format or manifest['output_format']
+    if output_file is None:
+        output_file = DELTA_OUTPUT_FILE.format(number=delta_number)
+        if output_format == 'db':
+            output_file = manifest['dumps'][0]['file']
+        elif output_format != 'sql':
+            output_file = os.path.splitext(output_file)[0]
+    compression = manifest.get('compression') if output_format == 'sql' else None
+    if compression:
+        output_file = compressed_path(output_file, compression)
+
+    params = {
+        'num_employees': num_employees + new_employees,
+        'num_projects': num_projects + new_projects,
+        'master_seed': manifest['master_seed'],
+        'batch_size': manifest['batch_size'],
+        # "today" moves forward with the attendance, so new hires can join up to the last new day
+        'reference_date': max(date.fromisoformat(manifest['reference_date']), new_attendance_end),
+        'months': manifest['months'],
+        'faker_pool_size': manifest['faker_pool_size'],
+        'output_format': output_format,
+        'seed_tag': f"delta{delta_number}",
+        'explicit_ids': True,
+    }
+    shards = plan_delta_shards(num_employees, num_projects, new_employees, new_projects, attendance_end, new_days)
+    sink = open_sink(output_format, output_file, manifest['batch_size'], write_ddl=False, compression=compression)
+    shard_count = _write_shards(sink, shards, params, workers,
+                                _faker_pools(manifest['master_seed'], manifest['faker_pool_size']))
+
+    manifest.update({
+        'num_employees': params['num_employees'],
+        'num_projects': params['num_projects'],
+        'attendance_end': max(attendance_end, new_attendance_end).isoformat(),
+    })
+    manifest['dumps'].append({'file': output_file, 'generated_at': datetime.now().isoformat(timespec='seconds'),
+                              'new_employees': new_employees, 'new_projects': new_projects,
+                              'attendance_days': new_days})
+    save_manifest(manifest_file, manifest)
+    return output_file, shard_count
+
+
+def regenerate_tables(manifest_file, tables, output_file=None, workers=None, output_format=None):
+    """
+    Rebuild only `tables` of the full dump recorded in manifest_file, bit-identical to the original.
+
+    Every shard has its own seed stream (derive_seed), so a table can be generated without the
+    others. Seed, extents of the full dump (deltas are not included), shard sizes and pool
+    settings come from the manifest. When the output format and batch size match the original,
+    each table's sha256 is checked against the manifest. Returns (output_file, {table: match}),
+    match being None when there was nothing to compare.
+    """
+    manifest = load_manifest(manifest_file)
+    unknown = [table for table in tables if table not in TABLE_SPECS]
+    if unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}")
+    if 'shard_sizes' not in manifest:
+        raise ValueError(f"{manifest_file} has no shard sizes; regenerate the full dump once to record them")
+    base = manifest['dumps'][0]
+    output_format = output_format or manifest['output_format']
+    output_file = output_file or REGENERATE_OUTPUT_FILE
+    if output_format != 'sql':
+        output_file = os.path.splitext(output_file)[0]
+
+    params = {
+        'num_employees': base['num_employees'],
+        'num_projects': base['num_projects'],
+        'master_seed': manifest['master_seed'],
+        'batch_size': manifest['batch_size'],
+        'reference_date': date.fromisoformat(manifest['reference_date']),
+        'months': manifest['months'],
+        'faker_pool_size': manifest['faker_pool_size'],
+        'output_format': output_format,
+        'attendance_start': date.fromisoformat(manifest['attendance_start']),
+    }
+    shards = [shard for shard in plan_shards(base['num_employees'], base['num_projects'],
+                                             params['attendance_start'], date.fromisoformat(base['attendance_end']),
+                                             manifest['shard_sizes'])
+              if shard[0] in tables]
+    sink = open_sink(output_format, output_file, manifest['batch_size'])
+    _write_shards(sink, shards, params, workers, _faker_pools(manifest['master_seed'], manifest['faker_pool_size']))
+
+    # Checksums cover the row bytes only, which also depend on the row format and INSERT batching
+    comparable = output_format == manifest['output_format'] and output_format in ('sql', 'tsv', 'csv')
+    matches = {}
+    for table in dict.fromkeys(shard[0] for shard in shards):
+        expected = manifest.get('tables', {}).get(table, {}).get('sha256')
+        actual = sink.table_stats[table]['sha256']
+        matches[table] = actual == expected if comparable and expected else None
+        if matches[table] is None:
+            print(f"{table}: {sink.table_stats[table]['rows']:,} rows, sha256 {actual or '-'}")
+        elif matches[table]:
+            print(f"✅ {table}: {sink.table_stats[table]['rows']:,} rows, identical to the original (sha256 {actual[:12]}…)")
+        else:
+            print(f"❌ {table}: sha256 {actual[:12]}… differs from the manifest's {expected[:12]}…")
+    return output_file, matches
+
+
+def main():
+    enable_profiling('parallel_generation')
+    # Deltas and table rebuilds reuse the manifest's seed; a full run draws one now if MASTER_SEED is None
+    seed = resolve_seed(MASTER_SEED) if GENERATION_MODE == 'full' else load_manifest(MANIFEST_FILE)['master_seed']
+    start_run('parallel_generation', mode=GENERATION_MODE, profile=PROFILE, output_format=OUTPUT_FORMAT,
+              seed=seed, workers=WORKERS)
+    if GENERATION_MODE == 'delta':
+        with profiled('generate_delta'):
+            output, shard_count = generate_delta(MANIFEST_FILE, DELTA_NEW_EMPLOYEES, DELTA_NEW_PROJECTS,
+                                                 DELTA_ATTENDANCE_DAYS, workers=WORKERS,
+                                                 extents_source=EXTENTS_SOURCE)
+        print(f"Delta with {DELTA_NEW_EMPLOYEES} new employees, {DELTA_NEW_PROJECTS} new projects and "
+              f"{DELTA_ATTENDANCE_DAYS} more attendance days generated as '{output}' from {shard_count} shards.")
+        finish_run('parallel_generation')
+        return
+    if GENERATION_MODE == 'table':
+        with profiled('generate_tables'):
+            output, matches = regenerate_tables(MANIFEST_FILE, REGENERATE_TABLES, REGENERATE_OUTPUT_FILE,
+                                                workers=WORKERS)
+        print(f"{', '.join(REGENERATE_TABLES)} regenerated as '{output}' from {MANIFEST_FILE}.")
+        finish_run('parallel_generation')
+        return
+
+    output = {'sql': OUTPUT_FILE, 'tsv': BULK_DIR, 'csv': CSV_DIR, 'parquet': PARQUET_DIR,
+              'db': DATABASE_NAME}[OUTPUT_FORMAT]
+    if OUTPUT_FORMAT == 'sql' and DUMP_COMPRESSION:
+        output = compressed_path(output, DUMP_COMPRESSION)
+    with profiled('generate'):
+        shard_count = generate_profile(PROFILE, output, master_seed=seed, output_format=OUTPUT_FORMAT,
+                                       manifest_file=MANIFEST_FILE, compression=DUMP_COMPRESSION)
+    if OUTPUT_FORMAT == 'db':
+        print(f"Database '{output}' filled directly from {shard_count} shards "
+              f"(profile '{PROFILE}', seed {seed}).")
+    elif OUTPUT_FORMAT != 'sql':
+        print(f"Schema and per-table {OUTPUT_FORMAT.upper()} files generated in '{output}/' from {shard_count} "
+              f"shards (profile '{PROFILE}', seed {seed}).")
+    else:
+        print(f"Full company database SQL script generated as '{output}' from {shard_count} shards "
+              f"(profile '{PROFILE}', seed {seed}).")
+    finish_run('parallel_generation')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import cProfile
+import glob
+import os
+import pstats
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from tqdm import tqdm
+
+# pyinstrument is optional: only needed for PROFILER = 'sampling'
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+# Terminal colors
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+# `python script_to_CSV_from_sql.py --profile` turns profiling on for that run; without the flag
+# every profiled() block is a plain pass-through
+PROFILE_FLAG = '--profile'
+# Set to the run's output directory once profiling is on; worker processes inherit it
+PROFILE_ENV = 'HR_PIPELINE_PROFILE'
+PROFILE_DIR = 'profiles'
+
+# 'cprofile' (deterministic, .prof files for snakeviz / pstats) or 'sampling' (pyinstrument,
+# much lower overhead, .html + .txt). 'sampling' falls back to cProfile when pyinstrument is missing.
+PROFILER = 'cprofile'
+
+# Hot functions listed per stage on screen and in the .txt next to each .prof
+PROFILE_TOP = 20
+
+_local = threading.local()
+
+
+def enable_profiling(script):
+    """
+    Turn profiling on for this run if --profile was passed (or a parent process already did).
+    Returns the directory the profiles go to, or None when profiling is off.
+    """
+    if PROFILE_FLAG in sys.argv[1:] and not os.environ.get(PROFILE_ENV):
+        directory = os.path.join(PROFILE_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{script}")
+        os.makedirs(os.path.join(directory, 'workers'), exist_ok=True)
+        os.environ[PROFILE_ENV] = directory
+        print(f"{YELLOW}🔬 Profiling on ({_profiler_kind()}), writing to {directory}/{RESET}")
+    return os.environ.get(PROFILE_ENV)
+
+
+def _profiler_kind():
+    if PROFILER == 'sampling' and pyinstrument is not None:
+        return 'sampling'
+    return 'cprofile'
+
+
+def hot_functions(stats, top=PROFILE_TOP):
+    # [(own seconds, cumulative seconds, calls, 'function (file:line)')], most own time first
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append((own, cumulative, calls, f"{function} ({os.path.basename(filename)}:{line})"))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _write_cprofile(stats, path, name, summary):
+    stats.dump_stats(path + '.prof')
+    with open(path + '.txt', 'w', encoding='utf-8') as f:
+        for key in ('tottime', 'cumulative'):
+            pstats.Stats(path + '.prof', stream=f).sort_stats(key).print_stats(PROFILE_TOP)
+    if summary:
+        total = max(stats.total_tt, 1e-9)
+        lines = [f"{BLUE}🔥 {name}: top {PROFILE_TOP} functions by own time ({total:.1f}s profiled){RESET}"]
+        for own, cumulative, calls, where in hot_functions(stats):
+            lines.append(f"   {own:8.2f}s {own / total:6.1%} {cumulative:9.2f}s cum {calls:>10,}  {where}")
+        tqdm.write('\n'.join(lines))
+        tqdm.write(f"{GREEN}   ↳ {path}.prof / .txt{RESET}")
+
+
+@contextmanager
+def profiled(name, summary=True, worker=False):
+    """
+    Profile the with-block as stage `name` when profiling is on; otherwise do nothing.
+
+    Writes {name}.prof + {name}.txt (or .html + .txt with the sampling profiler) and prints the
+    hot functions unless summary=False. worker=True puts the files under workers/ for
+    merge_worker_profiles(). Nested blocks in the same thread are not profiled again.
+    """
+    directory = os.environ.get(PROFILE_ENV)
+    # Compared by pid: a forked worker inherits the flag of the thread that forked it
+    if not directory or getattr(_local, 'active', None) == os.getpid():
+        yield
+        return
+
+    sampling = _profiler_kind() == 'sampling'
+    profiler = pyinstrument.Profiler() if sampling else cProfile.Profile()
+    try:
+        profiler.start() if sampling else profiler.enable()
+    except (ValueError, RuntimeError):
+        # Python 3.12+: one cProfile per interpreter; this block runs unprofiled next to another one
+        yield
+        return
+    _local.active = os.getpid()
+    try:
+        yield
+    finally:
+        _local.active = None
+        profiler.stop() if sampling else profiler.disable()
+        path = os.path.join(directory, 'workers' if worker else '', name)
+        if sampling:
+            with open(path + '.html', 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+            text = profiler.output_text(unicode=True, color=False)
+            with open(path + '.txt', 'w', encoding='utf-8') as f:
+                f.write(text)
+            if summary and not worker:
+                tqdm.write(f"{BLUE}🔥 {name}{RESET}\n" + '\n'.join(text.splitlines()[:PROFILE_TOP + 6]))
+        else:
+            _write_cprofile(pstats.Stats(profiler), path, name, summary and not worker)
+
+
+def merge_worker_profiles(stage):
+    """
+    Combine the workers/{stage}.{group}.{index}.prof files of process-pool workers into one
+    {stage}.{group}.prof per group plus {stage}.workers.prof for all of them, with its summary.
+    """
+    directory = os.environ.get(PROFILE_ENV)
+    if not directory:
+        return
+    paths = sorted(glob.glob(os.path.join(directory, 'workers', f"{stage}.*.prof")))
+    if not paths:
+        return
+    groups = {}
+    for path in paths:
+        groups.setdefault(os.path.basename(path).rsplit('.', 2)[0], []).append(path)
+    for group, group_paths in groups.items():
+        _write_cprofile(pstats.Stats(*group_paths), os.path.join(directory, group), group, summary=False)
+    _write_cprofile(pstats.Stats(*paths), os.path.join(directory, f"{stage}.workers"),
+                    f"{stage} (all {len(paths)} worker tasks)", summary=True)
@@ -1,8 +1,26 @@
 import mysql.connector
+import mysql.connector.pooling
 from tqdm import tqdm
 import os
 import re
-import io
+import sys
+import codecs
+import gzip
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+
+from db_config import config_no_db
+from table_specs import ddl_definitions
+from instrumentation import emit, span, count, timed, start_run, finish_run
+from profiling import profiled, enable_profiling
+
+# zstandard is optional: only needed for .sql.zst dumps
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 # ANSI Terminal Colors
 GREEN = '\033[92m'
@@ -12,87 +30,773 @@ BLUE = '\033[94m'
 DEEP_BLUE = '\033[38;5;18m'
 RESET = '\033[0m'
 
-# MySQL config
-config_no_db = {
-    'user': 'root',
-    'password': '17111998',
-    'host': 'localhost',
-    'use_pure': True,
-    'autocommit': False
-}
-
+# .sql, .sql.gz or .sql.zst (parallel_generation.py DUMP_COMPRESSION); compressed dumps are
+# decompressed on the fly and never written out uncompressed
 sql_file_path = 'company_database_full.sql'
 
+# Load mode: merge runs of INSERTs into the same table/columns into multi-row INSERTs
+COALESCE_INSERTS = True
+INSERT_BATCH_ROWS = 1000               # statements merged per batch (one commit per batch)
+INSERT_BATCH_BYTES = 4 * 1024 * 1024   # stay well below max_allowed_packet
+
+# 'sql' loads sql_file_path; 'bulk' loads schema.sql + per-table TSV files from bulk_dir with LOAD DATA LOCAL INFILE;
+# 'parallel' loads sql_file_path with one connection per table, LOAD_WORKERS at a time, parents before children
+LOAD_MODE = 'sql'
+bulk_dir = 'bulk_dump'
+LOAD_WORKERS = 4
+
+# True = add a delta dump (parallel_generation.py GENERATION_MODE = 'delta') to the existing
+# database instead of dropping and recreating it
+APPEND_LOAD = False
+
+# LOAD_MODE = 'sql': commit every CHECKPOINT_STATEMENTS statements or CHECKPOINT_BYTES of dump,
+# recording the dump offset reached in CHECKPOINT_DATABASE in the same transaction.
+# `python script_for_sql_loading.py --resume` continues an interrupted load from there.
+# Off by default: it creates CHECKPOINT_DATABASE on your server next to the loaded database.
+CHECKPOINT_LOAD = False
+CHECKPOINT_STATEMENTS = 10000
+CHECKPOINT_BYTES = 64 * 1024 * 1024
+CHECKPOINT_DATABASE = 'hr_pipeline_meta'
+RESUME_FLAG = '--resume'
+
+# True = create every table with only its columns and PRIMARY KEY, load the rows, then add its UNIQUE
+# keys, indexes and FOREIGN KEYs with one ALTER TABLE per table, INDEX_WORKERS tables at a time.
+# InnoDB then builds each secondary index once, sorted, instead of updating it row by row (any LOAD_MODE).
+DEFER_INDEXES = False
+INDEX_WORKERS = 4
+
+
+def find_dump(path):
+    # company_database_full.sql missing? Fall back to a compressed dump of the same name
+    if not os.path.exists(path):
+        for suffix in ('.zst', '.gz'):
+            if os.path.exists(path + suffix):
+                return path + suffix
+    return path
+
+
+def open_dump(filename):
+    """
+    Open a .sql / .sql.gz / .sql.zst dump for binary reading.
+
+    Returns (stream, raw): stream yields the decompressed SQL, raw is the file on disk, so
+    progress bars can follow raw.tell() (compressed bytes) against os.path.getsize().
+    """
+    raw = open(filename, 'rb')
+    if filename.endswith('.gz'):
+        return gzip.GzipFile(fileobj=raw, mode='rb'), raw
+    if filename.endswith('.zst'):
+        if zstandard is None:
+            raw.close()
+            raise ImportError(f"{filename} is zstd-compressed: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_size=1024 * 1024, read_across_frames=True), raw
+    return raw, raw
+
+
+def _follow_raw(bar, raw):
+    # on_read callback: move the bar to the on-disk position, whatever the decompressed chunk size was
+    return lambda n: bar.update(raw.tell() - bar.n)
+
 
 def extract_database_name(sql_script):
     match = re.search(r'CREATE DATABASE IF NOT EXISTS\s+`?(\w+)`?|USE\s+`?(\w+)`?', sql_script, re.IGNORECASE)
     return match.group(1) or match.group(2) if match else None
 
 
-def run_sql_script_with_progress(cursor, filename, buffer_size=16 * 1024 * 1024):
+# End of statement: ';' followed by optional spaces and a newline (same rule as the old re.split)
+STATEMENT_END = re.compile(r';[ \t\r]*\n')
+QUOTE_CHARS = ("'", '"', '`')
+
+
+def _advance_quote_state(text, lo, hi, state):
+    # Returns the (open quote, pending backslash) state after text[lo:hi]
+    quote, escaped = state
+    segment = text[lo:hi]
+    if not escaped and quote in (None, "'") and '\\' not in segment and '"' not in segment and '`' not in segment:
+        # Fast path for generated dumps: only single quotes, so parity decides ('' escapes count twice)
+        if segment.count("'") % 2:
+            quote = None if quote else "'"
+        return quote, False
+
+    for ch in segment:
+        if escaped:
+            escaped = False
+        elif quote:
+            if ch == '\\' and quote != '`':
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in QUOTE_CHARS:
+            quote = ch
+    return quote, escaped
+
+
+def iter_sql_statements(file, chunk_size=1024 * 1024, on_read=None, start_offset=None):
+    """
+    Yield SQL statements one by one from a binary file object, reading fixed-size chunks.
+
+    Tracks quote state so a ';' inside a string literal never ends a statement.
+    on_read(n) is called with the raw byte count of every chunk read, for progress bars.
+    Only the current chunk plus the unfinished statement are ever held in memory.
+    With start_offset (where file is positioned in the uncompressed dump) it yields
+    (statement, offset just past its ';') pairs instead, for load checkpoints.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    tail = ''
+    scanned = 0  # how much of tail is already folded into state
+    state = (None, False)
+    track = start_offset is not None
+    offset = start_offset  # dump offset of buffer[0]
+
+    while True:
+        raw = file.read(chunk_size)
+        if on_read and raw:
+            on_read(len(raw))
+        chunk = decoder.decode(raw, final=not raw)
+        if not raw and not chunk:
+            break
+
+        buffer = tail + chunk
+        start = 0
+        pos = scanned
+        if track:
+            # Byte offsets: characters are bytes unless the buffer has non-ASCII text
+            ascii_buffer = buffer.isascii()
+            nbytes = (lambda lo, hi: hi - lo) if ascii_buffer else (lambda lo, hi: len(buffer[lo:hi].encode('utf-8')))
+        for match in STATEMENT_END.finditer(buffer, scanned):
+            state = _advance_quote_state(buffer, pos, match.start(), state)
+            pos = match.start()
+            if state[0] is None:
+                stmt = buffer[start:match.start()].strip()
+                if track:
+                    offset += nbytes(start, match.end())
+                    if stmt:
+                        yield stmt, offset
+                elif stmt:
+                    yield stmt
+                start = pos = match.end()
+        tail = buffer[start:]
+        scanned = pos - start
+
+        if not raw:
+            break
+
+    stmt = tail.strip().rstrip(';').strip()
+    if stmt:
+        yield (stmt, offset + len(tail.encode('utf-8'))) if track else stmt
+
+
+INSERT_PATTERN = re.compile(r'INSERT\s+INTO\s+(`?\w+`?)\s*\(([^)]*)\)\s*VALUES\s*', re.IGNORECASE)
+
+
+def execute_statement(cursor, stmt, stats, table=None):
+    try:
+        cursor.execute(stmt)
+        stats['executed'] += 1
+        count('statements', 1, table)
+        count('rows', max(cursor.rowcount, 0), table)
+        return True
+    except mysql.connector.Error as err:
+        stats['failed'] += 1
+        count('errors', 1, table)
+        preview = stmt[:300].replace('\n', ' ')
+        print(f"\n{RED}❌ Error executing statement: {preview}...\n{err}{RESET}")
+        return False
+
+
+class InsertCoalescer:
+    """
+    Collects consecutive INSERTs into the same table with the same column list and
+    runs them as one multi-row INSERT, committing after every batch.
+
+    If a merged batch fails, its statements are replayed one by one so only the
+    bad rows are reported and skipped, exactly like the statement-by-statement mode.
+    """
+
+    def __init__(self, conn, cursor, stats, batch_rows=INSERT_BATCH_ROWS, batch_bytes=INSERT_BATCH_BYTES,
+                 checkpoint=None):
+        self.conn = conn
+        self.cursor = cursor
+        self.stats = stats
+        self.batch_rows = batch_rows
+        self.batch_bytes = batch_bytes
+        # With a LoadCheckpoint, batches are committed by it (every N statements / bytes) instead
+        self.checkpoint = checkpoint
+        self.key = None
+        self.header = None
+        self.statements = []
+        self.values = []
+        self.size = 0
+        self.offset = None
+
+    def add(self, stmt, offset=None):
+        """
+        Queue stmt if it is an INSERT ... VALUES; returns False for anything else.
+        offset is where stmt ends in the dump, handed to the checkpoint when its batch is done.
+        """
+        match = INSERT_PATTERN.match(stmt)
+        if not match:
+            return False
+
+        key = (match.group(1).strip('`').lower(), ''.join(match.group(2).split()))
+        if key != self.key:
+            self.flush()
+            self.key = key
+            self.header = stmt[:match.end()].rstrip()
+
+        values = stmt[match.end():]
+        self.offset = offset
+        self.statements.append(stmt)
+        self.values.append(values)
+        self.size += len(values)
+        if len(self.values) >= self.batch_rows or self.size >= self.batch_bytes:
+            self.flush()
+        return True
+
+    def flush(self):
+        if not self.statements:
+            return
+        table = self.key[0]
+        with timed(table):
+            if len(self.statements) == 1:
+                execute_statement(self.cursor, self.statements[0], self.stats, table)
+            else:
+                try:
+                    self.cursor.execute(f"{self.header} " + ",\n".join(self.values))
+                    self.stats['executed'] += len(self.statements)
+                    count('statements', len(self.statements), table)
+                    count('rows', max(self.cursor.rowcount, 0), table)
+                except mysql.connector.Error:
+                    count('retries', len(self.statements), table)
+                    for stmt in self.statements:
+                        execute_statement(self.cursor, stmt, self.stats, table)
+            if self.checkpoint:
+                self.checkpoint.advance(self.offset, len(self.statements))
+            else:
+                self.conn.commit()
+        self.statements = []
+        self.values = []
+        self.size = 0
+
+
+class LoadCheckpoint:
+    """
+    Bounded transactions plus a restart point for one dump.
+
+    advance() is called as statements complete; every CHECKPOINT_STATEMENTS statements or
+    CHECKPOINT_BYTES of dump it writes the offset reached to {CHECKPOINT_DATABASE}.load_checkpoint
+    and commits, so the offset and the rows before it are committed together. A crash
+    loses at most the uncommitted tail, which --resume then executes again.
+    With DEFER_INDEXES the ALTER TABLEs still to run are saved along with it (`deferred`).
+    """
+
+    def __init__(self, conn, cursor, dump, database, every_statements=CHECKPOINT_STATEMENTS,
+                 every_bytes=CHECKPOINT_BYTES, deferred=None):
+        self.conn = conn
+        self.cursor = cursor
+        self.dump = os.path.abspath(dump)
+        self.database = database
+        self.every_statements = every_statements
+        self.every_bytes = every_bytes
+        self.table = f"`{CHECKPOINT_DATABASE}`.`load_checkpoint`"
+        stat = os.stat(dump)
+        self.dump_id = (stat.st_size, stat.st_mtime_ns)
+        self.offset = 0           # committed
+        self.statements = 0
+        self.pending_offset = 0   # executed, not committed yet
+        self.pending = 0
+        self.deferred = deferred  # {table: ALTER TABLE} not built yet
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{CHECKPOINT_DATABASE}`;")
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                       "dump VARCHAR(512) PRIMARY KEY, dump_size BIGINT, dump_mtime_ns BIGINT, "
+                       "database_name VARCHAR(64), byte_offset BIGINT, statements BIGINT, "
+                       "status VARCHAR(16), deferred_ddl TEXT, updated_at DATETIME);")
+
+    def saved(self):
+        """
+        {'offset', 'statements', 'status', 'deferred'} of this dump's last run, or None (none, or the
+        dump changed since). status is 'running', 'indexes' (rows loaded, deferred indexes not all built) or 'done'.
+        """
+        self.cursor.execute(f"SELECT dump_size, dump_mtime_ns, byte_offset, statements, status, deferred_ddl "
+                            f"FROM {self.table} WHERE dump = %s", (self.dump,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        if tuple(row[:2]) != self.dump_id:
+            print(f"{YELLOW}⚠️ {self.dump} changed since its checkpoint was written; ignoring the checkpoint.{RESET}")
+            return None
+        return {'offset': row[2], 'statements': row[3], 'status': row[4], 'deferred': json.loads(row[5] or '{}')}
+
+    def resume_from(self, saved):
+        self.offset = self.pending_offset = saved['offset']
+        self.statements = saved['statements']
+        if saved['deferred']:
+            # Built even if DEFER_INDEXES was switched off since: those tables have no indexes yet
+            self.deferred = {**saved['deferred'], **(self.deferred or {})}
+
+    def start(self):
+        self._write('running')
+        self.conn.commit()
+
+    def advance(self, offset, statements=1):
+        self.pending_offset = offset
+        self.pending += statements
+        if self.pending >= self.every_statements or offset - self.offset >= self.every_bytes:
+            self.commit()
+
+    def commit(self, status='running'):
+        # Checkpoint row and the rows it covers go in one transaction
+        if self.pending_offset != self.offset or status != 'running':
+            self.statements += self.pending
+            self._write(status)
+            self.offset, self.pending = self.pending_offset, 0
+            count('checkpoints')
+        self.conn.commit()
+
+    def finish(self):
+        self.commit('indexes' if self.deferred else 'done')
+
+    def _write(self, status):
+        self.cursor.execute(f"REPLACE INTO {self.table} (dump, dump_size, dump_mtime_ns, database_name, "
+                            "byte_offset, statements, status, deferred_ddl, updated_at) "
+                            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+                            (self.dump, *self.dump_id, self.database, self.pending_offset, self.statements, status,
+                             json.dumps(self.deferred or {})))
+
+
+def _skip_to(file, raw, offset, chunk_size=1024 * 1024):
+    # Uncompressed dumps seek straight to the checkpoint; compressed ones have to be read up to it
+    if file is raw:
+        raw.seek(offset)
+        return
+    while offset > 0:
+        data = file.read(min(chunk_size, offset))
+        if not data:
+            raise EOFError(f"Checkpoint offset lies past the end of the dump ({offset:,} bytes short)")
+        offset -= len(data)
+
+
+def run_sql_script_with_progress(cursor, filename, buffer_size=1024 * 1024, conn=None, coalesce=False,
+                                 checkpoint=None, deferred=None):
+    """
+    Execute every statement of filename, streaming it in buffer_size chunks.
+
+    With coalesce=True (needs conn), runs of INSERTs are merged into multi-row
+    INSERTs of up to INSERT_BATCH_ROWS statements and committed per batch.
+    With a LoadCheckpoint, commits happen at its checkpoints instead and the run starts
+    at its committed offset (after `USE` of its database), for --resume.
+    With deferred (a dict), CREATE TABLEs keep only their PRIMARY KEY and the ALTER TABLE
+    adding the rest is collected in it for build_deferred_indexes().
+    """
     file_size = os.path.getsize(filename)
-    buffer = io.StringIO()
-
-    with open(filename, 'r', encoding='utf-8') as file:
-        with tqdm(total=file_size, unit='B', unit_scale=True, desc="📥 Reading SQL file", colour='cyan') as read_bar:
-            while True:
-                chunk = file.read(buffer_size)
-                if not chunk:
-                    break
-                buffer.write(chunk)
-                read_bar.update(len(chunk))
-
-    sql_script = buffer.getvalue()
-    buffer.close()
-
-    # Split by ; outside strings (basic safe split)
-    statements = re.split(r';\s*\n', sql_script)
-    total_statements = len(statements)
-
-    with tqdm(total=total_statements, desc="⚙️ Executing SQL", bar_format=(
-        GREEN + "({percentage:6.2f}%)" + RESET + DEEP_BLUE + " {bar} " + RESET +
-        GREEN + "| {n_fmt}/{total_fmt} |" + YELLOW + " ({rate_fmt})" + RESET),
-              unit='stmts', colour='green') as exec_bar:
-        for stmt in statements:
-            stmt = stmt.strip()
-            if not stmt:
-                exec_bar.update(1)
-                continue
+    stats = {'executed': 0, 'failed': 0}
+    coalescer = InsertCoalescer(conn, cursor, stats, INSERT_BATCH_ROWS, INSERT_BATCH_BYTES, checkpoint) \
+        if coalesce else None
+    file, raw = open_dump(filename)
+    resume_offset = checkpoint.offset if checkpoint else 0
+
+    with span('load', mode='sql', dump=filename, resumed_from=resume_offset) as load_span, raw, file:
+        if resume_offset:
+            _skip_to(file, raw, resume_offset)
+            cursor.execute(f"USE `{checkpoint.database}`;")
+            tqdm.write(f"{BLUE}⏩ Resuming at byte {resume_offset:,} of the dump "
+                       f"({checkpoint.statements:,} statements already committed).{RESET}")
+        skipped = raw.tell()
+        with tqdm(total=file_size, initial=skipped, desc="⚙️ Executing SQL", bar_format=(
+            GREEN + "({percentage:6.2f}%)" + RESET + DEEP_BLUE + " {bar} " + RESET +
+            GREEN + "| {n_fmt}/{total_fmt} |" + YELLOW + " ({rate_fmt})" + RESET),
+                  unit='B', unit_scale=True, colour='green') as exec_bar:
+            # Statements run as soon as they are parsed; the bar follows the (compressed) bytes consumed
+            if checkpoint:
+                _run_checkpointed(cursor, iter_sql_statements(file, buffer_size, _follow_raw(exec_bar, raw),
+                                                              start_offset=resume_offset),
+                                  stats, coalescer, checkpoint, deferred)
+            else:
+                for stmt in iter_sql_statements(file, buffer_size, on_read=_follow_raw(exec_bar, raw)):
+                    if coalescer:
+                        if coalescer.add(stmt):
+                            continue
+                        coalescer.flush()
+                    if deferred is not None:
+                        stmt = defer_table_indexes(stmt, deferred)
+                    execute_statement(cursor, stmt, stats)
+                if coalescer:
+                    coalescer.flush()
+        load_span.count('bytes', raw.tell() - skipped)
+
+    print(f"{GREEN}✅ Executed {stats['executed']} statements ({stats['failed']} failed).{RESET}")
+
+
+def _run_checkpointed(cursor, statements, stats, coalescer, checkpoint, deferred=None):
+    # The dump's own START TRANSACTION / COMMIT would commit behind the checkpoint's back, so they are dropped
+    for stmt, offset in statements:
+        if coalescer and coalescer.add(stmt, offset):
+            continue
+        if TRANSACTION_PATTERN.match(stmt):
+            continue
+        if coalescer:
+            coalescer.flush()
+        if INSERT_PATTERN.match(stmt):
+            execute_statement(cursor, stmt, stats)
+            checkpoint.advance(offset)
+            continue
+        # Schema statements commit implicitly: checkpoint right before and right after them
+        checkpoint.commit()
+        if deferred is not None:
+            stmt = defer_table_indexes(stmt, deferred)
+        execute_statement(cursor, stmt, stats)
+        checkpoint.advance(offset)
+        checkpoint.commit()
+    if coalescer:
+        coalescer.flush()
+    checkpoint.finish()
+
+
+def bulk_load_tables(conn, cursor, directory):
+    """
+    LOAD DATA LOCAL INFILE every {table}.tsv in directory, in the CREATE TABLE order of schema.sql.
+
+    Foreign-key and unique checks stay off for the whole load and keys are disabled per
+    table (honoured by MyISAM, ignored by InnoDB); everything is switched back on at the end.
+    """
+    with open(os.path.join(directory, 'schema.sql'), 'r', encoding='utf-8') as file:
+        tables = re.findall(r'CREATE TABLE\s+(?:IF NOT EXISTS\s+)?`?(\w+)`?', file.read(), re.IGNORECASE)
+    files = [(table, os.path.join(directory, f"{table}.tsv")) for table in tables]
+    files = [(table, path) for table, path in files if os.path.exists(path)]
+    total_bytes = sum(os.path.getsize(path) for _, path in files)
+
+    cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
+    cursor.execute("SET UNIQUE_CHECKS=0;")
+    with span('load', mode='bulk', directory=directory) as load_span, \
+            tqdm(total=total_bytes, desc="🚚 Bulk loading", unit='B', unit_scale=True, colour='green') as load_bar:
+        for table, path in files:
+            with open(path, 'r', encoding='utf-8') as file:
+                columns = file.readline().rstrip('\n').split('\t')
+            load_bar.set_postfix_str(table)
             try:
-                cursor.execute(stmt)
+                with load_span.timed(table):
+                    cursor.execute(f"ALTER TABLE `{table}` DISABLE KEYS;")
+                    cursor.execute(
+                        f"LOAD DATA LOCAL INFILE '{os.path.abspath(path).replace(os.sep, '/')}' "
+                        f"INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                        f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+                        f"({', '.join(f'`{column}`' for column in columns)});")
+                    load_span.count('rows', cursor.rowcount, table)
+                    tqdm.write(f"{GREEN}✅ Loaded {YELLOW}{cursor.rowcount}{GREEN} rows into '{table}'.{RESET}")
+                    cursor.execute(f"ALTER TABLE `{table}` ENABLE KEYS;")
+                    conn.commit()
+                load_span.count('statements', 1, table)
             except mysql.connector.Error as err:
-                preview = stmt[:300].replace('\n', ' ')
-                print(f"\n{RED}❌ Error executing statement: {preview}...\n{err}{RESET}")
-            exec_bar.update(1)
+                load_span.count('errors', 1, table)
+                tqdm.write(f"{RED}❌ Error bulk loading '{table}' from {path}:\n{err}{RESET}")
+            load_span.count('bytes', os.path.getsize(path), table)
+            load_bar.update(os.path.getsize(path))
+    cursor.execute("SET UNIQUE_CHECKS=1;")
+    cursor.execute("SET FOREIGN_KEY_CHECKS=1;")
+
+
+CREATE_TABLE_PATTERN = re.compile(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?', re.IGNORECASE)
+FOREIGN_KEY_PATTERN = re.compile(r'FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+`?(\w+)`?', re.IGNORECASE)
+TRANSACTION_PATTERN = re.compile(r'(START\s+TRANSACTION|BEGIN|COMMIT)$', re.IGNORECASE)
+# Table-level definitions DEFER_INDEXES moves to the ALTER TABLE; PRIMARY KEY and CHECK stay
+DEFERRED_DEFINITION_PATTERN = re.compile(r'(CONSTRAINT\s+`?\w+`?\s+)?(FOREIGN|UNIQUE|KEY|INDEX|FULLTEXT|SPATIAL)\b',
+                                         re.IGNORECASE)
+INLINE_UNIQUE_PATTERN = re.compile(r'\s+UNIQUE(\s+KEY)?\b', re.IGNORECASE)
+
+
+def split_deferred_ddl(stmt):
+    """
+    Split a CREATE TABLE into (CREATE TABLE with only its columns and PRIMARY KEY, ALTER TABLE
+    adding its UNIQUE keys, indexes and FOREIGN KEYs in one statement, or None if there are none).
+    """
+    table = CREATE_TABLE_PATTERN.match(stmt).group(1)
+    kept, added = [], []
+    for definition in ddl_definitions(stmt):
+        if DEFERRED_DEFINITION_PATTERN.match(definition):
+            added.append(f"ADD {definition}")
+            continue
+        unique = INLINE_UNIQUE_PATTERN.search(definition)
+        if unique and not definition.upper().startswith(('PRIMARY', 'CONSTRAINT', 'CHECK')):
+            # department_name VARCHAR(50) UNIQUE -> the column now, ADD UNIQUE (department_name) later
+            kept.append(definition[:unique.start()] + definition[unique.end():])
+            added.append(f"ADD UNIQUE ({definition.split(None, 1)[0]})")
+            continue
+        kept.append(definition)
+    create = stmt[:stmt.index('(') + 1] + "\n  " + ",\n  ".join(kept) + "\n" + stmt[stmt.rindex(')'):]
+    return create, (f"ALTER TABLE `{table}` " + ", ".join(added) if added else None)
+
+
+def defer_table_indexes(stmt, deferred):
+    # CREATE TABLE -> columns and PRIMARY KEY only; its ALTER TABLE goes into deferred. Other statements pass.
+    create = CREATE_TABLE_PATTERN.match(stmt)
+    if not create:
+        return stmt
+    stmt, alter = split_deferred_ddl(stmt)
+    if alter:
+        deferred[create.group(1).lower()] = alter
+    return stmt
+
+
+def _build_table_indexes(connection_pool, table, alter):
+    conn = connection_pool.get_connection()
+    cursor = conn.cursor()
+    try:
+        with span('build_indexes', table=table) as table_span, profiled(f"build_indexes.{table}", summary=False):
+            # Without FK checks InnoDB adds the FOREIGN KEYs in place, without re-reading the parents
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
+            try:
+                cursor.execute(alter)
+                table_span.count('statements')
+                return True
+            except mysql.connector.Error as err:
+                table_span.count('errors')
+                tqdm.write(f"{RED}❌ Error building the indexes of '{table}':\n{alter}\n{err}{RESET}")
+                return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def build_deferred_indexes(database_name, deferred, workers=INDEX_WORKERS, checkpoint=None):
+    """
+    Run the ALTER TABLEs DEFER_INDEXES collected, up to `workers` tables at a time, each over
+    its own connection. Built tables are removed from deferred (and from the checkpoint, so
+    --resume only retries the ones that failed or never ran). Returns how many failed.
+    """
+    if not deferred:
+        return 0
+    connection_pool = mysql.connector.pooling.MySQLConnectionPool(
+        pool_name='hr_indexes', pool_size=max(1, min(workers, len(deferred))), database=database_name,
+        **config_no_db)
+    failed = 0
+    with span('build_indexes', tables=len(deferred)), ThreadPoolExecutor(max_workers=workers) as executor, \
+            tqdm(total=len(deferred), desc="🗂️ Building indexes", unit='tables', colour='cyan') as progress:
+        futures = {executor.submit(_build_table_indexes, connection_pool, table, alter): table
+                   for table, alter in deferred.items()}
+        for future in as_completed(futures):
+            table = futures[future]
+            if future.result():
+                deferred.pop(table)
+                if checkpoint:
+                    checkpoint.finish()
+                tqdm.write(f"{GREEN}✅ Indexes and foreign keys of '{table}' built.{RESET}")
+            else:
+                failed += 1
+            progress.update(1)
+    return failed
+
+
+def split_dump_by_table(cursor, filename, spool_dir, buffer_size=1024 * 1024, deferred=None):
+    """
+    First pass of the parallel loader.
+
+    Runs every schema statement (CREATE DATABASE, USE, CREATE TABLE, SET ...) right away on
+    cursor, appends each table's INSERTs to its own spool file, and reads the parent tables
+    of every table from its FOREIGN KEY clauses. Transaction statements are dropped, since
+    each worker commits its own batches. With deferred, CREATE TABLEs go through
+    defer_table_indexes() and no table waits for its parents.
+    Returns {table: {'path', 'statements', 'parents'}} in dump order.
+    """
+    tables = {}
+    spools = {}
+    stats = {'executed': 0, 'failed': 0}
+
+    def table_entry(name):
+        if name not in tables:
+            tables[name] = {'path': os.path.join(spool_dir, f"{name}.sql"), 'statements': 0, 'parents': set()}
+        return tables[name]
+
+    file, raw = open_dump(filename)
+    try:
+        with span('load_split', dump=filename) as split_span, raw, file, \
+                tqdm(total=os.path.getsize(filename), desc="🔀 Splitting SQL by table",
+                     unit='B', unit_scale=True, colour='cyan') as split_bar:
+            for stmt in iter_sql_statements(file, buffer_size, on_read=_follow_raw(split_bar, raw)):
+                insert = INSERT_PATTERN.match(stmt)
+                if insert:
+                    table = insert.group(1).strip('`').lower()
+                    entry = table_entry(table)
+                    if table not in spools:
+                        spools[table] = open(entry['path'], 'w', encoding='utf-8')
+                    spools[table].write(stmt + ";\n")
+                    entry['statements'] += 1
+                    continue
+                if TRANSACTION_PATTERN.match(stmt):
+                    continue
+
+                create = CREATE_TABLE_PATTERN.match(stmt)
+                if create:
+                    table = create.group(1).lower()
+                    parents = {parent.lower() for parent in FOREIGN_KEY_PATTERN.findall(stmt)}
+                    # No FOREIGN KEYs exist until the load is over, so children need not wait
+                    table_entry(table)['parents'] = set() if deferred is not None else parents - {table}
+                    if deferred is not None:
+                        stmt = defer_table_indexes(stmt, deferred)
+                execute_statement(cursor, stmt, stats)
+            split_span.count('bytes', raw.tell())
+    finally:
+        for spool in spools.values():
+            spool.close()
+    return tables
+
+
+def load_table_spool(connection_pool, table, entry, progress):
+    # Worker: load one table's spooled INSERTs over its own pooled connection
+    stats = {'executed': 0, 'failed': 0}
+    conn = connection_pool.get_connection()
+    cursor = conn.cursor()
+    try:
+        # Worker threads aren't seen by the main thread's profiler: each table gets its own .prof
+        with span('load', table=table, mode='parallel') as table_span, profiled(f"load.{table}", summary=False):
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
+            cursor.execute("SET UNIQUE_CHECKS=0;")
+            coalescer = InsertCoalescer(conn, cursor, stats, INSERT_BATCH_ROWS, INSERT_BATCH_BYTES) \
+                if COALESCE_INSERTS else None
+            with open(entry['path'], 'rb') as file:
+                for stmt in iter_sql_statements(file):
+                    if coalescer:
+                        coalescer.add(stmt)
+                    else:
+                        execute_statement(cursor, stmt, stats, table)
+                    progress.update(1)
+            if coalescer:
+                coalescer.flush()
+            conn.commit()
+            table_span.count('bytes', os.path.getsize(entry['path']))
+    finally:
+        cursor.close()
+        conn.close()  # hands the connection back to the pool
+    return stats
+
+
+def run_parallel_load(cursor, filename, database_name, workers=LOAD_WORKERS, deferred=None):
+    """
+    Load filename with up to `workers` tables in flight at once.
+
+    A table starts as soon as every table it references through a FOREIGN KEY
+    has finished, so the small tables no longer wait behind attendance/payroll.
+    """
+    spool_dir = tempfile.mkdtemp(prefix='hr_load_', dir=os.path.dirname(os.path.abspath(filename)))
+    try:
+        tables = split_dump_by_table(cursor, filename, spool_dir, deferred=deferred)
+        pending = {table: entry for table, entry in tables.items() if entry['statements']}
+        done = set(tables) - set(pending)
+        connection_pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name='hr_loader', pool_size=max(1, min(workers, len(pending))), database=database_name,
+            **config_no_db)
+
+        totals = {'executed': 0, 'failed': 0}
+        total_statements = sum(entry['statements'] for entry in pending.values())
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                tqdm(total=total_statements, desc="⚙️ Executing SQL (parallel)", unit='stmts',
+                     colour='green') as progress:
+            running = {}
+            while pending or running:
+                ready = [table for table, entry in pending.items()
+                         if entry['parents'] <= done | (entry['parents'] - set(tables))]
+                if not ready and not running:
+                    # Circular FOREIGN KEYs: nothing can satisfy the order, so just load what is left
+                    tqdm.write(f"{YELLOW}⚠️ Circular foreign keys between {sorted(pending)}; loading anyway.{RESET}")
+                    ready = list(pending)
+                for table in ready:
+                    entry = pending.pop(table)
+                    tqdm.write(f"{BLUE}▶️ Loading '{table}' ({entry['statements']} statements){RESET}")
+                    running[executor.submit(load_table_spool, connection_pool, table, entry, progress)] = table
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    table = running.pop(future)
+                    stats = future.result()
+                    totals['executed'] += stats['executed']
+                    totals['failed'] += stats['failed']
+                    done.add(table)
+                    tqdm.write(f"{GREEN}✅ Finished '{table}' ({stats['failed']} failed).{RESET}")
+
+        print(f"{GREEN}✅ Executed {totals['executed']} statements ({totals['failed']} failed) "
+              f"over {workers} connections.{RESET}")
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
 
 
 def main():
     conn = None
     cursor = None
+    enable_profiling('script_for_sql_loading')
+    resume = RESUME_FLAG in sys.argv[1:]
+    start_run('script_for_sql_loading', load_mode=LOAD_MODE, coalesce=COALESCE_INSERTS, append=APPEND_LOAD,
+              checkpoint=CHECKPOINT_LOAD, resume=resume, defer_indexes=DEFER_INDEXES)
     try:
+        bulk = LOAD_MODE == 'bulk'
+        script_path = os.path.join(bulk_dir, 'schema.sql') if bulk else find_dump(sql_file_path)
+
         # Pre-read to get DB name
-        with open(sql_file_path, 'r', encoding='utf-8') as file:
-            sql_preview = file.read(512 * 1024)
+        file, raw = open_dump(script_path)
+        with raw, file:
+            sql_preview = file.read(512 * 1024).decode('utf-8', errors='ignore')
         database_name = extract_database_name(sql_preview)
         if not database_name:
             print(f"{RED}❌ Could not determine DB name from SQL.{RESET}")
             return
 
         # Connect to MySQL server (no DB yet)
-        conn = mysql.connector.connect(**config_no_db)
+        conn = mysql.connector.connect(**config_no_db, allow_local_infile=bulk)
         cursor = conn.cursor()
+        if bulk:
+            try:
+                cursor.execute("SET GLOBAL local_infile = 1;")
+            except mysql.connector.Error as err:
+                print(f"{YELLOW}⚠️ Could not enable local_infile on the server ({err}); "
+                      f"LOAD DATA LOCAL may be refused.{RESET}")
 
-        # Drop and create DB
         cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
         cursor.execute("SET UNIQUE_CHECKS=0;")
-        cursor.execute(f"DROP DATABASE IF EXISTS `{database_name}`;")
-        print(f"{GREEN}✅ Dropped database '{YELLOW}{database_name}{GREEN}' (if it existed).{RESET}")
 
-        # Execute script
-        run_sql_script_with_progress(cursor, sql_file_path)
-        conn.commit()
+        # Checkpoints (and --resume) cover the statement-by-statement 'sql' mode
+        deferred = {} if DEFER_INDEXES else None
+        checkpoint = LoadCheckpoint(conn, cursor, script_path, database_name, deferred=deferred) \
+            if CHECKPOINT_LOAD and LOAD_MODE == 'sql' else None
+        saved = checkpoint.saved() if checkpoint and resume else None
+        if resume and saved is None:
+            print(f"{YELLOW}⚠️ No checkpoint to resume {script_path} from (checkpoints need CHECKPOINT_LOAD = True "
+                  f"and LOAD_MODE = 'sql'); loading from the start.{RESET}")
+        if saved and saved['status'] == 'done':
+            print(f"{GREEN}✅ {script_path} was already loaded completely into '{database_name}'; nothing to resume.{RESET}")
+            return
+
+        # Drop and create DB
+        if saved:
+            checkpoint.resume_from(saved)
+            deferred = checkpoint.deferred
+            emit('resume', dump=script_path, offset=saved['offset'], statements=saved['statements'])
+            print(f"{YELLOW}⏩ Resuming the load of '{database_name}' from its last checkpoint.{RESET}")
+        elif APPEND_LOAD:
+            print(f"{YELLOW}➕ Appending to existing database '{database_name}'.{RESET}")
+        else:
+            cursor.execute(f"DROP DATABASE IF EXISTS `{database_name}`;")
+            print(f"{GREEN}✅ Dropped database '{YELLOW}{database_name}{GREEN}' (if it existed).{RESET}")
+        if checkpoint and not saved:
+            checkpoint.start()
+
+        # Execute script (schema only in bulk mode), then the TSV files
+        with profiled('load'):
+            if LOAD_MODE == 'parallel':
+                run_parallel_load(cursor, script_path, database_name, LOAD_WORKERS, deferred=deferred)
+            elif not (saved and saved['status'] == 'indexes'):
+                run_sql_script_with_progress(cursor, script_path, conn=conn, coalesce=COALESCE_INSERTS,
+                                             checkpoint=checkpoint, deferred=deferred)
+            conn.commit()
+            if bulk:
+                bulk_load_tables(conn, cursor, bulk_dir)
+
+        # DEFER_INDEXES: the rows are in, now every table's secondary indexes and FOREIGN KEYs in one pass
+        if deferred:
+            with profiled('build_indexes'):
+                failed = build_deferred_indexes(database_name, deferred, INDEX_WORKERS, checkpoint)
+            if failed:
+                print(f"{RED}❌ {failed} table(s) are missing indexes or foreign keys (see above).{RESET}")
 
-        print(f"{GREEN}✅ Recreated and populated DB '{database_name}' successfully.{RESET}")
+        action = "Appended to" if APPEND_LOAD else "Resumed and populated" if saved else "Recreated and populated"
+        print(f"{GREEN}✅ {action} DB '{database_name}' successfully.{RESET}")
 
     except mysql.connector.Error as err:
         print(f"{RED}❌ MySQL Error: {err}{RESET}")
@@ -101,6 +805,7 @@ def main():
             cursor.close()
         if conn:
             conn.close()
+        finish_run('script_for_sql_loading')
 
 
 if __name__ == "__main__":
@@ -2,14 +2,62 @@ import os
 import time
 import pandas as pd
 from tqdm import tqdm, trange
-from openpyxl.utils import get_column_letter
 from colorama import Fore, Style, init
+from openpyxl import Workbook
+from column_widths import table_column_widths, apply_column_widths
+from instrumentation import span, start_run, finish_run
+from profiling import profiled, enable_profiling
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pandas' own parser is used instead
+    pa = pa_csv = None
 
 init(autoreset=True)
 
 INPUT_DIR = '.'  # or set your CSV folder path
 OUTPUT_FILE = 'output.xlsx'
 MAX_EXCEL_ROWS = 1048576
+MAX_COLUMN_WIDTH = 50
+
+# True = read each CSV in typed chunks and append them to a write-only workbook,
+# so memory holds a few chunks instead of the whole file and the whole workbook.
+# False = old path: pd.read_csv() the whole file, then pd.ExcelWriter.
+STREAMING_CSV = True
+CSV_CHUNK_ROWS = 200000          # rows per chunk with the pandas parser
+CSV_BLOCK_BYTES = 16 * 1024**2   # bytes per chunk with the pyarrow parser
+USE_PYARROW_CSV = True           # ignored when pyarrow is not installed
+
+# Column types of the tables the toolkit exports; columns not listed here
+# (and CSVs of other tables) fall back to type inference.
+CSV_SCHEMAS = {
+    'departments': {'department_id': 'int', 'department_name': 'str'},
+    'employees': {'empID': 'int', 'employee_name': 'str', 'age': 'int', 'gender': 'category',
+                  'date_of_birth': 'date', 'date_of_joining': 'date', 'role': 'category', 'salary': 'int',
+                  'department_id': 'int', 'address': 'str', 'contact_number': 'str', 'email_id': 'str',
+                  'marital_status': 'category'},
+    'projects': {'project_id': 'int', 'project_name': 'str', 'start_date': 'date', 'end_date': 'date',
+                 'status': 'category', 'budget': 'int', 'department_id': 'int'},
+    'employee_project': {'empID': 'int', 'project_id': 'int', 'role_in_project': 'category',
+                         'assigned_date': 'date'},
+    'attendance': {'attendance_id': 'int', 'empID': 'int', 'date': 'date', 'status': 'category'},
+    'bonuses': {'bonus_id': 'int', 'empID': 'int', 'hours_overtime': 'int', 'bonus_amount': 'int',
+                'bonus_date': 'date'},
+    'payroll': {'payroll_id': 'int', 'empID': 'int', 'month': 'category', 'base_salary': 'int',
+                'bonus_paid': 'int', 'deductions': 'int', 'net_salary': 'int', 'payment_date': 'date'},
+    'leaves': {'leave_id': 'int', 'empID': 'int', 'leave_type': 'category', 'start_date': 'date',
+               'end_date': 'date', 'status': 'category'},
+    'training': {'training_id': 'int', 'empID': 'int', 'training_name': 'category', 'start_date': 'date',
+                 'end_date': 'date', 'status': 'category'},
+    'assets': {'asset_id': 'int', 'empID': 'int', 'asset_name': 'category', 'asset_type': 'category',
+               'purchase_date': 'date', 'status': 'category'},
+    'employee_benefits': {'benefit_id': 'int', 'empID': 'int', 'benefit_name': 'category',
+                          'benefit_value': 'str'},
+}
+
+# Nullable Int32 so an empty cell doesn't turn a whole column into floats
+PANDAS_DTYPES = {'int': 'Int32', 'str': 'str', 'category': 'category'}
 
 # Color variables
 GREEN = Fore.GREEN
@@ -31,11 +79,124 @@ def write_df_chunks_to_excel(df, base_name, writer):
         sheet_name = f"{base_name}_part{i + 1}" if chunks > 1 else base_name
         chunk.to_excel(writer, sheet_name=sheet_name, index=False)
 
-        # Autofit columns (optional, but slow for very wide sheets)
-        worksheet = writer.sheets[sheet_name]
-        for col_idx, col in enumerate(chunk.columns, 1):
-            max_length = max(chunk[col].astype(str).map(len).max(), len(str(col)))
-            worksheet.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
+        # Autofit columns: estimated once per file from a sample, reused by every part
+        widths = table_column_widths(base_name, df)
+        apply_column_widths(writer.sheets[sheet_name], widths, max_width=MAX_COLUMN_WIDTH)
+
+
+def _arrow_type(kind):
+    return {'int': pa.int32(), 'str': pa.string(), 'category': pa.dictionary(pa.int32(), pa.string()),
+            'date': pa.date32()}[kind]
+
+
+def iter_csv_chunks(file_path, table, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Yield a CSV file as typed DataFrame chunks.
+
+    Known tables get explicit types from CSV_SCHEMAS (INT -> int32, DATE -> date,
+    ENUM-like text -> category) instead of inference over the whole file.
+    Uses pyarrow's streaming reader when available, pandas' chunked reader otherwise.
+    Malformed rows are skipped either way, like on_bad_lines='skip'.
+    """
+    header = list(pd.read_csv(file_path, nrows=0).columns)
+    kinds = {col: kind for col, kind in CSV_SCHEMAS.get(table, {}).items() if col in header}
+
+    if pa_csv is not None and USE_PYARROW_CSV:
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            # Faker addresses contain line breaks inside quoted values
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: 'skip'),
+            convert_options=pa_csv.ConvertOptions(column_types={col: _arrow_type(kind)
+                                                                for col, kind in kinds.items()}),
+        )
+        empty = True
+        for batch in reader:
+            # date32 columns come back as datetime.date objects
+            empty = False
+            yield batch.to_pandas()
+        if empty:
+            yield pd.DataFrame(columns=header)
+        return
+
+    date_cols = [col for col, kind in kinds.items() if kind == 'date']
+    dtypes = {col: PANDAS_DTYPES[kind] for col, kind in kinds.items() if kind != 'date'}
+    for chunk in pd.read_csv(file_path, dtype=dtypes, parse_dates=date_cols, date_format='%Y-%m-%d',
+                             chunksize=chunk_rows, on_bad_lines='skip'):
+        for col in date_cols:
+            chunk[col] = chunk[col].dt.date
+        yield chunk
+
+
+def write_chunks_to_sheets(chunks, base_name, workbook):
+    """
+    Append DataFrame chunks to write-only sheets, rolling over to {base_name}_partN at MAX_EXCEL_ROWS.
+
+    The row count is not known up front, so the first sheet is renamed to
+    {base_name}_part1 once a second one is needed. Returns the rows written.
+    """
+    max_data_rows = MAX_EXCEL_ROWS - 1
+    sheets = []
+    sheet_rows = 0
+    rows_written = 0
+
+    for chunk in chunks:
+        # Excel cells can't hold NaN/NaT: write them as empty cells
+        values = chunk.astype(object).where(chunk.notna(), None)
+        rows = list(values.itertuples(index=False, name=None))
+        while rows or not sheets:
+            if not sheets or sheet_rows == max_data_rows:
+                if len(sheets) == 1:
+                    sheets[0].title = f"{base_name}_part1"
+                sheet_name = f"{base_name}_part{len(sheets) + 1}" if sheets else base_name
+                worksheet = workbook.create_sheet(sheet_name)
+                widths = table_column_widths(base_name, chunk)
+                apply_column_widths(worksheet, widths, max_width=MAX_COLUMN_WIDTH)
+                worksheet.append([str(col) for col in chunk.columns])
+                sheets.append(worksheet)
+                sheet_rows = 0
+
+            take = rows[:max_data_rows - sheet_rows]
+            for row in take:
+                worksheet.append(row)
+            sheet_rows += len(take)
+            rows_written += len(take)
+            rows = rows[len(take):]
+    return rows_written
+
+
+def convert_streaming(csv_files):
+    # Streaming mode of main(): every CSV into write-only sheets of one workbook
+    sheets_created = 0
+    workbook = Workbook(write_only=True)
+    for csv_file in tqdm(csv_files, desc=f"{CYAN}📝 Writing CSVs to Excel{RESET}", colour='cyan', ncols=100):
+        start_time = time.time()
+        file_path = os.path.join(INPUT_DIR, csv_file)
+        table = os.path.splitext(csv_file)[0]
+        sheet_base = table[:31]
+
+        try:
+            with span('csv_to_excel', table=table) as table_span:
+                rows = write_chunks_to_sheets(iter_csv_chunks(file_path, table), sheet_base, workbook)
+                table_span.count('rows', rows)
+                table_span.count('bytes', os.path.getsize(file_path))
+
+            elapsed = time.time() - start_time
+            print(f"{GREEN}✅ Finished '{csv_file}' → Sheet '{sheet_base}' ({rows} rows) in {elapsed:.2f} sec "
+                  f"({rows / max(elapsed, 1e-9):,.0f} rows/sec){RESET}")
+            sheets_created += 1
+
+        except Exception as e:
+            print(f"{RED}❌ Error processing {csv_file}: {e}{RESET}")
+
+    if sheets_created == 0:
+        raise RuntimeError(f"{RED}No valid CSVs processed. Aborting Excel file creation.{RESET}")
+    print(f"{YELLOW}💾 Saving '{OUTPUT_FILE}'...{RESET}")
+    with span('csv_to_excel_save', output=OUTPUT_FILE) as save_span:
+        workbook.save(OUTPUT_FILE)
+        save_span.count('bytes', os.path.getsize(OUTPUT_FILE))
+    print(f"\n{GREEN}🎉 All {sheets_created} CSVs successfully merged into '{OUTPUT_FILE}'!{RESET}\n")
+    return sheets_created
 
 
 def main():
@@ -52,17 +213,28 @@ def main():
     print(f"\n{Fore.YELLOW}🔄 Starting conversion to {Fore.LIGHTBLUE_EX}'{OUTPUT_FILE}'{Style.RESET_ALL}...\n")
 
     sheets_created = 0
+    enable_profiling('script_from_csv_to_excel')
+    start_run('script_from_csv_to_excel', files=len(csv_files), streaming=STREAMING_CSV)
+
+    if STREAMING_CSV:
+        with profiled('csv_to_excel'):
+            convert_streaming(csv_files)
+        finish_run('script_from_csv_to_excel')
+        return
 
-    with pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
+    with profiled('csv_to_excel'), pd.ExcelWriter(OUTPUT_FILE, engine='openpyxl') as writer:
         for csv_file in tqdm(csv_files, desc=f"{CYAN}📝 Writing CSVs to Excel{RESET}", colour='cyan', ncols=100):
             start_time = time.time()
             file_path = os.path.join(INPUT_DIR, csv_file)
 
             try:
-                df = pd.read_csv(file_path, on_bad_lines='skip')
-                sheet_base = os.path.splitext(csv_file)[0][:31]
+                with span('csv_to_excel', table=os.path.splitext(csv_file)[0]) as table_span:
+                    df = pd.read_csv(file_path, on_bad_lines='skip')
+                    sheet_base = os.path.splitext(csv_file)[0][:31]
 
-                write_df_chunks_to_excel(df, sheet_base, writer)
+                    write_df_chunks_to_excel(df, sheet_base, writer)
+                    table_span.count('rows', len(df))
+                    table_span.count('bytes', os.path.getsize(file_path))
 
                 elapsed = time.time() - start_time
                 print(f"{GREEN}✅ Finished '{csv_file}' → Sheet '{sheet_base}' in {elapsed:.2f} sec{RESET}")
@@ -75,6 +247,7 @@ def main():
             raise RuntimeError(f"{RED}No valid CSVs processed. Aborting Excel file creation.{RESET}")
 
     print(f"\n{GREEN}🎉 All {sheets_created} CSVs successfully merged into '{OUTPUT_FILE}'!{RESET}\n")
+    finish_run('script_from_csv_to_excel')
 
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
+import os
 import mysql.connector
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 import pandas as pd
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from export_state import export_incremental
+from instrumentation import span, start_run, finish_run
+from profiling import profiled, enable_profiling
 
 # Terminal colors
 GREEN = '\033[92m'
@@ -17,39 +22,149 @@ MYSQL_PASSWORD = '17111998'
 MYSQL_HOST = 'localhost'
 MYSQL_DB = 'company_db'
 
-# Connect using mysql.connector
-conn = mysql.connector.connect(
-    host=MYSQL_HOST,
-    user=MYSQL_USER,
-    password=MYSQL_PASSWORD,
-    database=MYSQL_DB,
-    use_pure=True
-)
-cursor = conn.cursor()
-
-# Use SQLAlchemy for pandas
-engine_str = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
-engine = create_engine(engine_str)
-
-# Get all tables
-cursor.execute("SHOW TABLES")
-tables = [row[0] for row in cursor.fetchall()]
-total_tables = len(tables)
-
-# ✅ Print table count and names
-print(f"\n{YELLOW}📊 Total tables found in database: {total_tables}{RESET}")
-print(f"{BLUE}📋 Table names:{RESET}")
-for name in tables:
-    print(f" - {name}")
-
-# Export each table to CSV with a progress bar
-print(f"\n{YELLOW}📁 Starting export to CSV files...{RESET}\n")
-for i, table in enumerate(tqdm(tables, desc="Exporting Tables", unit="table", colour="blue")):
-    tqdm.write(f"{GREEN}📤 Exporting table {i+1}/{total_tables}: {table}{RESET}")
-    df = pd.read_sql(f"SELECT * FROM `{table}`", engine)
-    df.to_csv(f"{table}.csv", index=False)
-
-cursor.close()
-conn.close()
-
-print(f"\n{GREEN}✅ Export completed. All tables written to CSV.{RESET}")
+# Rows pulled from the server-side cursor and written per to_csv() call.
+# Memory is bounded by this, not by the size of the table.
+CHUNK_SIZE = 100000
+
+# Tables exported at the same time, each on its own pooled connection (1 = one after another)
+EXPORT_WORKERS = 4
+
+# True = only export rows added since the last run and append them to the existing CSVs.
+# Progress (high-water marks / checksums per table) is kept in EXPORT_STATE_FILE.
+INCREMENTAL_EXPORT = False
+EXPORT_STATE_FILE = 'export_state_csv.json'
+
+
+def get_engine(workers=1):
+    # Use SQLAlchemy for pandas; one pooled connection per export worker
+    engine_str = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
+    return create_engine(engine_str, pool_size=workers, max_overflow=workers)
+
+
+def count_rows(engine, table):
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM `{table}`")).scalar()
+
+
+def export_table_to_csv(engine, table, output_path=None, chunk_size=CHUNK_SIZE, total_rows=None,
+                        position=None, overall_bar=None, query=None, params=None, append=False, row_filter=None):
+    """
+    Stream one table into a CSV file, chunk_size rows at a time.
+
+    stream_results=True makes pymysql use an unbuffered server-side cursor (SSCursor),
+    so rows arrive as they are written instead of the whole table being loaded first.
+    position/overall_bar let concurrent exports stack their bars and feed a shared total.
+    query/params/append/row_filter are used by the incremental export (export_state.py).
+    Returns the number of rows written.
+    """
+    output_path = output_path or f"{table}.csv"
+    if total_rows is None:
+        total_rows = count_rows(engine, table)
+    append = append and os.path.exists(output_path)
+
+    rows_written = 0
+    # Own .prof per table when run from an export thread; inside a profiled stage it adds nothing
+    with span('csv_export', table=table, append=append) as table_span, \
+            profiled(f"csv_export.{table}", summary=False), \
+            engine.connect().execution_options(stream_results=True) as conn, \
+            open(output_path, 'a' if append else 'w', newline='', encoding='utf-8') as f, \
+            tqdm(total=total_rows, desc=f"📤 {table}", unit='rows', unit_scale=True, colour='green',
+                 leave=False, position=position) as row_bar:
+        start_offset = f.tell()
+        header = not append
+        query = text(query or f"SELECT * FROM `{table}`")
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=chunk_size):
+            row_bar.update(len(chunk))
+            if overall_bar is not None:
+                overall_bar.update(len(chunk))
+            if row_filter is not None:
+                chunk = chunk[row_filter(chunk)]
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+            rows_written += len(chunk)
+
+        if header:
+            # Empty table and no chunk at all: still write the header line
+            result = conn.execute(text(f"SELECT * FROM `{table}` LIMIT 0"))
+            pd.DataFrame(columns=list(result.keys())).to_csv(f, index=False)
+        table_span.count('rows', rows_written)
+        table_span.count('bytes', f.tell() - start_offset)
+    return rows_written
+
+
+def export_tables_concurrently(engine, tables, workers=EXPORT_WORKERS, export_fn=export_table_to_csv,
+                               extension='csv'):
+    """
+    Export several tables at the same time from a thread pool.
+
+    The top bar shows rows exported across all tables; below it every running
+    table has its own bar. Total time ends up close to the largest table alone.
+    export_fn/extension let other exporters (e.g. Parquet) reuse the same scheduling.
+    """
+    row_counts = {table: count_rows(engine, table) for table in tables}
+    with tqdm(total=sum(row_counts.values()), desc="📦 All tables", unit='rows', unit_scale=True,
+              colour='blue', position=0) as overall_bar, ThreadPoolExecutor(max_workers=workers) as executor:
+        # Biggest tables first so they are never the last ones started
+        ordered = sorted(tables, key=row_counts.get, reverse=True)
+        futures = {
+            executor.submit(export_fn, engine, table, total_rows=row_counts[table],
+                            position=1 + i % workers, overall_bar=overall_bar): table
+            for i, table in enumerate(ordered)
+        }
+        for future in as_completed(futures):
+            table = futures[future]
+            try:
+                tqdm.write(f"{GREEN}✅ {table}: {future.result()} rows written to {table}.{extension}{RESET}")
+            except Exception as err:
+                tqdm.write(f"{RED}❌ Error exporting {table}: {err}{RESET}")
+
+
+def main():
+    # Connect using mysql.connector
+    conn = mysql.connector.connect(
+        host=MYSQL_HOST,
+        user=MYSQL_USER,
+        password=MYSQL_PASSWORD,
+        database=MYSQL_DB,
+        use_pure=True
+    )
+    cursor = conn.cursor()
+    engine = get_engine(EXPORT_WORKERS)
+
+    # Get all tables
+    cursor.execute("SHOW TABLES")
+    tables = [row[0] for row in cursor.fetchall()]
+    total_tables = len(tables)
+
+    # ✅ Print table count and names
+    print(f"\n{YELLOW}📊 Total tables found in database: {total_tables}{RESET}")
+    print(f"{BLUE}📋 Table names:{RESET}")
+    for name in tables:
+        print(f" - {name}")
+
+    print(f"\n{YELLOW}📁 Starting export to CSV files...{RESET}\n")
+    enable_profiling('script_to_CSV_from_sql')
+    start_run('script_to_CSV_from_sql', workers=EXPORT_WORKERS, incremental=INCREMENTAL_EXPORT, tables=total_tables)
+    # Stage span = total wall time; rows and bytes are on the per-table spans
+    with span('csv_export', workers=EXPORT_WORKERS), profiled('csv_export'):
+        if INCREMENTAL_EXPORT:
+            export_incremental(engine, tables, export_table_to_csv, EXPORT_STATE_FILE, 'csv')
+        elif EXPORT_WORKERS > 1:
+            export_tables_concurrently(engine, tables, EXPORT_WORKERS)
+        else:
+            # Export each table to CSV with a progress bar
+            for i, table in enumerate(tqdm(tables, desc="Exporting Tables", unit="table", colour="blue")):
+                tqdm.write(f"{GREEN}📤 Exporting table {i+1}/{total_tables}: {table}{RESET}")
+                rows = export_table_to_csv(engine, table)
+                tqdm.write(f"{GREEN}   ↳ {rows} rows written to {table}.csv{RESET}")
+
+    cursor.close()
+    conn.close()
+    engine.dispose()
+    finish_run('script_to_CSV_from_sql')
+
+    print(f"\n{GREEN}✅ Export completed. All tables written to CSV.{RESET}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 import mysql.connector
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 import pandas as pd
-from tqdm import tqdm, trange
+from tqdm import tqdm
 import math
-from openpyxl.utils import get_column_letter
-import logging
 from openpyxl.styles import Font
-from datetime import datetime
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import Workbook
+from script_to_CSV_from_sql import count_rows
+from column_widths import (AUTOFIT_SAMPLE_ROWS, enum_lengths, estimate_column_widths, table_column_widths,
+                           apply_column_widths)
+from instrumentation import span, emit, start_run, finish_run
+from profiling import profiled, merge_worker_profiles, enable_profiling
 
 # Terminal colors
 GREEN = '\033[92m'
@@ -22,81 +27,288 @@ MYSQL_USER = 'root'
 MYSQL_PASSWORD = '17111998'
 MYSQL_HOST = 'localhost'
 MYSQL_DB = 'company_db'
+ENGINE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
 
 # Excel limits
 MAX_EXCEL_ROWS = 1048576
 
-# Connect to MySQL
-conn = mysql.connector.connect(
-    host=MYSQL_HOST,
-    user=MYSQL_USER,
-    password=MYSQL_PASSWORD,
-    database=MYSQL_DB,
-    use_pure=True
-)
-cursor = conn.cursor()
-
-# Use SQLAlchemy for pandas read_sql
-engine_str = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
-engine = create_engine(engine_str)
-
-# Fetch all tables
-cursor.execute("SHOW TABLES")
-tables = [row[0] for row in cursor.fetchall()]
-
-print(f"\n{YELLOW}Total tables to export: {len(tables)}{RESET}\n")
-
-# Setup logging
-log_file = "process.log"
-logging.basicConfig(filename=log_file, level=logging.INFO, format='%(asctime)s - %(message)s')
-if os.path.exists(log_file):
-    with open(log_file, 'a') as f:
-        f.write("\n" + "="*40 + f"\nRun started at {datetime.now()}\n")
-
-# Progress bar for exporting tables
-excel_writer_progress = tqdm(total=1, desc=GREEN + "📁 Opening ExcelWriter..." + RESET, colour='green')
-with pd.ExcelWriter('output.xlsx', engine='openpyxl') as writer:
-    excel_writer_progress.update(1)
-    excel_writer_progress.set_description_str(GREEN + "✅ ExcelWriter ready" + RESET)
-    excel_writer_progress.close()
-
-    # Tables loop
-    for table in tqdm(tables, desc="📄 Exporting tables", colour='green', leave=True):
-        print(f"{BLUE}📤 Exporting table: {table}{RESET}")
-        logging.info(f"Exporting table: {table}")
-
-        df = pd.read_sql(f"SELECT * FROM `{table}`", engine)
-        total_rows = len(df)
-        max_data_rows = MAX_EXCEL_ROWS - 1
-        chunks = math.ceil(total_rows / max_data_rows)
-
-        # Chunk loop
-        for i in trange(chunks, desc=f"🧮 Chunking {table}", colour='yellow', leave=True):
-            start = i * max_data_rows
-            end = start + max_data_rows
-            chunk_df = df.iloc[start:end]
-
-            sheet_name = f"{table}_part{i+1}" if chunks > 1 else table
-            chunk_df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-            worksheet = writer.sheets[sheet_name]
-            logging.info(f"Wrote sheet: {sheet_name} with {len(chunk_df)} rows")
-
-            # Column autofit
-            autofit_iter = tqdm(
-                enumerate(chunk_df.columns, 1),
-                desc=f"✏️ Autofitting {sheet_name}",
-                colour='blue',
-                leave=False
-            )
-            for col_idx, col in autofit_iter:
-                max_length = max(chunk_df[col].astype(str).map(len).max(), len(col))
-                worksheet.column_dimensions[get_column_letter(col_idx)].width = max_length + 2
-                logging.debug(f"Column {col} width set")
-
-print(f"{GREEN}🎉 Export complete!{RESET}")
-
-logging.info("Export process complete.")
-
-
-print(f"\n{GREEN}Export completed successfully!{RESET}")
+# Rows pulled from the server-side cursor per round trip; memory stays at one chunk
+# instead of the whole table plus the whole workbook
+CHUNK_SIZE = 50000
+
+# 'single'    -> everything in output.xlsx (one write-only workbook, tables one after another)
+# 'per_table' -> one workbook per table in WORKBOOK_DIR, written in parallel: the concurrent export
+# 'per_part'  -> like per_table, but big tables are also split into one workbook per 1M-row part
+EXCEL_OUTPUT = 'single'
+WORKBOOK_DIR = 'excel_export'
+INDEX_WORKBOOK = 'index.xlsx'
+INDEX_COLUMNS = ['Table', 'Sheet', 'Rows', 'Workbook']
+
+# Processes writing workbooks at the same time (per_table / per_part)
+EXPORT_PROCESSES = os.cpu_count()
+
+
+def _select_query(table, key_range=None):
+    if key_range is None:
+        return text(f"SELECT * FROM `{table}`"), {}
+    # One part of a split table: a primary-key range, read in key order
+    key, lo, hi = key_range
+    conditions, params = [], {}
+    if lo is not None:
+        conditions.append(f"`{key}` >= :lo")
+        params['lo'] = lo
+    if hi is not None:
+        conditions.append(f"`{key}` < :hi")
+        params['hi'] = hi
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return text(f"SELECT * FROM `{table}`{where} ORDER BY `{key}`"), params
+
+
+def write_table_streaming(workbook, engine, table, chunk_size=CHUNK_SIZE, total_rows=None, key_range=None,
+                          first_part=None, progress=True):
+    """
+    Stream one table into write-only sheets, rolling over to {table}_partN at MAX_EXCEL_ROWS.
+
+    Rows go from the server-side cursor straight into the sheet XML; nothing but
+    the current chunk is held in memory. key_range=(pk, lo, hi) and first_part
+    export a single part of a split table. Returns [(sheet_name, rows), ...].
+    """
+    if total_rows is None:
+        total_rows = count_rows(engine, table)
+    enums = enum_lengths(engine, table)
+    max_data_rows = MAX_EXCEL_ROWS - 1
+    parts = max(1, math.ceil(total_rows / max_data_rows))
+    split = first_part is not None or parts > 1
+
+    worksheet = None
+    sheet_name = None
+    sheet_rows = 0
+    part = (first_part or 1) - 1
+    sheets = []
+
+    def close_sheet():
+        elapsed = time.perf_counter() - sheet_started
+        sheets.append((sheet_name, sheet_rows))
+        emit('sheet', stage='excel_export', table=table, sheet=sheet_name, rows=sheet_rows,
+             wall_s=round(elapsed, 4), rows_per_s=round(sheet_rows / max(elapsed, 1e-9), 1))
+
+    with span('excel_export', table=table, part=first_part) as table_span, \
+            engine.connect().execution_options(stream_results=True) as conn, \
+            tqdm(total=total_rows, desc=f"🧮 Streaming {table}", unit='rows', unit_scale=True,
+                 colour='yellow', leave=True, disable=not progress) as row_bar:
+        result = conn.execute(*_select_query(table, key_range))
+        header = list(result.keys())
+
+        for rows in result.partitions(chunk_size):
+            while rows:
+                if worksheet is None or sheet_rows == max_data_rows:
+                    if worksheet is not None:
+                        close_sheet()
+                    part += 1
+                    sheet_name = f"{table}_part{part}" if split or part > 1 else table
+                    worksheet = workbook.create_sheet(sheet_name)
+                    # Write-only sheets need their widths before the first row;
+                    # estimated from the first chunk and reused by every part
+                    sample = pd.DataFrame.from_records(rows[:AUTOFIT_SAMPLE_ROWS], columns=header)
+                    apply_column_widths(worksheet, table_column_widths(table, sample, enums))
+                    worksheet.append(header)
+                    sheet_rows = 0
+                    sheet_started = time.perf_counter()
+
+                take = rows[:max_data_rows - sheet_rows]
+                for row in take:
+                    worksheet.append(tuple(row))
+                sheet_rows += len(take)
+                row_bar.update(len(take))
+                rows = rows[len(take):]
+
+        if worksheet is None:
+            # Empty table: header-only sheet, same as to_excel() would give
+            sheet_name = table
+            worksheet = workbook.create_sheet(sheet_name)
+            worksheet.append(header)
+            sheet_started = time.perf_counter()
+        close_sheet()
+        table_span.count('rows', sum(rows for _, rows in sheets))
+    return sheets
+
+
+def primary_key_column(engine, table):
+    # Single-column primary key, or None (composite key / no key)
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND CONSTRAINT_NAME = 'PRIMARY'"
+        ), {'table': table}).fetchall()
+    return rows[0][0] if len(rows) == 1 else None
+
+
+def plan_workbook_jobs(engine, tables, per_part=False):
+    """
+    One job per output workbook: (table, part, key_range, rows).
+
+    With per_part, a table bigger than one sheet is cut into MAX_EXCEL_ROWS - 1 row
+    slices of its primary key, so each part can be read and written by its own process.
+    Biggest jobs come first so they are never the last ones started.
+    """
+    max_data_rows = MAX_EXCEL_ROWS - 1
+    jobs = []
+    for table in tables:
+        total_rows = count_rows(engine, table)
+        parts = math.ceil(total_rows / max_data_rows)
+        key = primary_key_column(engine, table) if per_part and parts > 1 else None
+        if key is None:
+            jobs.append((table, None, None, total_rows))
+            continue
+
+        # Key where each part starts, found from the previous part's start so the
+        # whole walk reads each index entry once (OFFSET still scans the entries it skips)
+        bounds = [None]
+        with engine.connect() as conn:
+            for part in range(1, parts):
+                where, params = ("", {}) if bounds[-1] is None else (f" WHERE `{key}` >= :last", {'last': bounds[-1]})
+                bounds.append(conn.execute(text(
+                    f"SELECT `{key}` FROM `{table}`{where} ORDER BY `{key}` LIMIT 1 OFFSET {max_data_rows}"
+                ), params).scalar())
+        bounds.append(None)
+        for part in range(parts):
+            rows = min(max_data_rows, total_rows - part * max_data_rows)
+            jobs.append((table, part + 1, (key, bounds[part], bounds[part + 1]), rows))
+    return sorted(jobs, key=lambda job: job[3], reverse=True)
+
+
+_worker_engine = None
+
+
+def _init_worker():
+    # Each process needs its own connection; engines cannot be shared across processes
+    global _worker_engine
+    _worker_engine = create_engine(ENGINE_URL, pool_size=1)
+
+
+def export_workbook(job, output_dir=WORKBOOK_DIR):
+    """Write one job from plan_workbook_jobs() to its own workbook. Runs in a worker process."""
+    table, part, key_range, rows = job
+    filename = f"{table}_part{part}.xlsx" if part else f"{table}.xlsx"
+    started = time.perf_counter()
+
+    with profiled(f"excel_export.{table}.{part or 0}", worker=True):
+        workbook = Workbook(write_only=True)
+        sheets = write_table_streaming(workbook, _worker_engine, table, total_rows=rows, key_range=key_range,
+                                       first_part=part, progress=False)
+        path = os.path.join(output_dir, filename)
+        workbook.save(path)
+
+    elapsed = time.perf_counter() - started
+    written = sum(sheet_rows for _, sheet_rows in sheets)
+    emit('workbook', stage='excel_export', table=table, part=part, workbook=filename, rows=written,
+         bytes=os.path.getsize(path), wall_s=round(elapsed, 4), rows_per_s=round(written / max(elapsed, 1e-9), 1))
+    return filename, sheets
+
+
+def write_index_workbook(output_dir, entries):
+    # Small table of contents: one row per sheet, linking to its workbook
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'index'
+    worksheet.append(INDEX_COLUMNS)
+    for cell in worksheet[1]:
+        cell.font = Font(bold=True)
+
+    for table, sheet_name, rows, filename in entries:
+        worksheet.append([table, sheet_name, rows, filename])
+        link = worksheet.cell(row=worksheet.max_row, column=4)
+        link.hyperlink = f"{filename}#'{sheet_name}'!A1"
+        link.style = 'Hyperlink'
+
+    apply_column_widths(worksheet, estimate_column_widths(pd.DataFrame(entries, columns=INDEX_COLUMNS)))
+    workbook.save(os.path.join(output_dir, INDEX_WORKBOOK))
+
+
+def export_workbooks_parallel(engine, tables, output_dir=WORKBOOK_DIR, processes=EXPORT_PROCESSES,
+                              per_part=False):
+    """
+    Write every table (or every part) to its own workbook from a process pool, then an index workbook.
+
+    Workbooks share nothing, so unlike output.xlsx they can be built at the same
+    time; with per_part even a single huge table spreads over all cores.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = plan_workbook_jobs(engine, tables, per_part)
+    # Workers open their own connections; don't hand them copies of ours
+    engine.dispose()
+
+    results = {}
+    with tqdm(total=sum(job[3] for job in jobs), desc="📦 All workbooks", unit='rows', unit_scale=True,
+              colour='blue') as overall_bar, \
+            ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+        futures = {executor.submit(export_workbook, job, output_dir): job for job in jobs}
+        for future in as_completed(futures):
+            table, part, _, rows = futures[future]
+            try:
+                filename, sheets = future.result()
+                results[(table, part or 0)] = (filename, sheets)
+                tqdm.write(f"{GREEN}✅ {filename}: {sum(r for _, r in sheets)} rows{RESET}")
+            except Exception as err:
+                tqdm.write(f"{RED}❌ Error exporting {table}{f' part {part}' if part else ''}: {err}{RESET}")
+                emit('error', stage='excel_export', table=table, part=part, error=f"{type(err).__name__}: {err}")
+            overall_bar.update(rows)
+    merge_worker_profiles('excel_export')
+
+    # Index in table order, parts in order
+    order = {table: i for i, table in enumerate(tables)}
+    entries = []
+    for table, part in sorted(results, key=lambda key: (order[key[0]], key[1])):
+        filename, sheets = results[(table, part)]
+        entries.extend((table, sheet_name, sheet_rows, filename) for sheet_name, sheet_rows in sheets)
+    write_index_workbook(output_dir, entries)
+    print(f"{GREEN}📑 Index written to {os.path.join(output_dir, INDEX_WORKBOOK)}{RESET}")
+
+
+def main():
+    # Connect to MySQL
+    conn = mysql.connector.connect(
+        host=MYSQL_HOST,
+        user=MYSQL_USER,
+        password=MYSQL_PASSWORD,
+        database=MYSQL_DB,
+        use_pure=True
+    )
+    cursor = conn.cursor()
+
+    # Use SQLAlchemy for pandas read_sql
+    engine = create_engine(ENGINE_URL)
+
+    # Fetch all tables
+    cursor.execute("SHOW TABLES")
+    tables = [row[0] for row in cursor.fetchall()]
+
+    print(f"\n{YELLOW}Total tables to export: {len(tables)}{RESET}\n")
+
+    enable_profiling('script_to_excel_from_sql')
+    start_run('script_to_excel_from_sql', output=EXCEL_OUTPUT, tables=len(tables))
+
+    with span('excel_export', output=EXCEL_OUTPUT), profiled('excel_export'):
+        if EXCEL_OUTPUT in ('per_table', 'per_part'):
+            print(f"{YELLOW}📚 Writing separate workbooks ({EXCEL_OUTPUT}) to {WORKBOOK_DIR}/ "
+                  f"with {EXPORT_PROCESSES} processes{RESET}")
+            export_workbooks_parallel(engine, tables, WORKBOOK_DIR, EXPORT_PROCESSES,
+                                      per_part=(EXCEL_OUTPUT == 'per_part'))
+        else:
+            workbook = Workbook(write_only=True)
+            for table in tqdm(tables, desc="📄 Exporting tables", colour='green', leave=True):
+                print(f"{BLUE}📤 Exporting table: {table}{RESET}")
+                write_table_streaming(workbook, engine, table)
+
+            print(f"{YELLOW}💾 Saving output.xlsx...{RESET}")
+            workbook.save('output.xlsx')
+
+    print(f"{GREEN}🎉 Export complete!{RESET}")
+    finish_run('script_to_excel_from_sql')
+
+    print(f"\n{GREEN}Export completed successfully!{RESET}")
+
+
+if __name__ == "__main__":
+    main()
+
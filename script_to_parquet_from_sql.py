@@ -0,0 +1,220 @@
+import json
+import os
+import re
+import shutil
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from tqdm import tqdm
+
+import pandas as pd
+
+from script_to_CSV_from_sql import get_engine, count_rows, export_tables_concurrently
+from export_state import export_incremental
+from instrumentation import span, start_run, finish_run
+
+# Terminal colors
+GREEN = '\033[92m'
+RED = '\033[91m'
+YELLOW = '\033[93m'
+BLUE = '\033[94m'
+RESET = '\033[0m'
+
+# MySQL config lives in script_to_CSV_from_sql.py (get_engine)
+
+# Rows per Parquet row group / Arrow record batch, streamed from a server-side cursor
+CHUNK_SIZE = 100000
+
+# Tables exported at the same time, each on its own pooled connection (1 = one after another)
+EXPORT_WORKERS = 4
+
+# 'parquet' -> {table}.parquet, 'arrow' -> {table}.arrow (Arrow IPC file, memory-mappable)
+EXPORT_FORMAT = 'parquet'
+
+# Parquet codec: 'snappy' (fast), 'zstd' (smaller), or None
+PARQUET_COMPRESSION = 'snappy'
+
+# True = only export rows added since the last run. Appended rows go into
+# {table}.parquet/part-NNNNN.parquet, which pd.read_parquet('{table}.parquet') reads as one table.
+INCREMENTAL_EXPORT = False
+EXPORT_STATE_FILE = 'export_state_parquet.json'
+
+# MySQL DATA_TYPE -> Arrow type; ENUM and DECIMAL are handled in arrow_type()
+ARROW_TYPES = {
+    'tinyint': pa.int32(),
+    'smallint': pa.int32(),
+    'mediumint': pa.int32(),
+    'int': pa.int32(),
+    'integer': pa.int32(),
+    'bigint': pa.int64(),
+    'float': pa.float32(),
+    'double': pa.float64(),
+    'date': pa.date32(),
+    'datetime': pa.timestamp('us'),
+    'timestamp': pa.timestamp('us'),
+    'char': pa.string(),
+    'varchar': pa.string(),
+    'tinytext': pa.string(),
+    'text': pa.string(),
+    'mediumtext': pa.string(),
+    'longtext': pa.string(),
+}
+
+DECIMAL_PATTERN = re.compile(r'decimal\((\d+),\s*(\d+)\)', re.IGNORECASE)
+ENUM_VALUE_PATTERN = re.compile(r"'((?:[^']|'')*)'")
+
+
+def arrow_type(data_type, column_type):
+    data_type = data_type.lower()
+    if data_type == 'enum':
+        # Stored once per row group as a dictionary, rows are just int32 codes
+        return pa.dictionary(pa.int32(), pa.string())
+    if data_type == 'decimal':
+        precision, scale = DECIMAL_PATTERN.match(column_type).groups()
+        return pa.decimal128(int(precision), int(scale))
+    return ARROW_TYPES.get(data_type, pa.string())
+
+
+def table_schema(engine, table):
+    """Build the Arrow schema of a table from information_schema.COLUMNS."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT COLUMN_NAME, DATA_TYPE, COLUMN_TYPE, IS_NULLABLE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table ORDER BY ORDINAL_POSITION"
+        ), {'table': table}).fetchall()
+    fields = []
+    for name, data_type, column_type, nullable in rows:
+        metadata = None
+        if data_type.lower() == 'enum':
+            # Keep the declared values so every row group shares one fixed dictionary
+            values = [v.replace("''", "'") for v in ENUM_VALUE_PATTERN.findall(column_type)]
+            metadata = {'enum_values': json.dumps(values)}
+        fields.append(pa.field(name, arrow_type(data_type, column_type), nullable=(nullable == 'YES'),
+                               metadata=metadata))
+    return pa.schema(fields)
+
+
+def rows_to_record_batch(rows, schema):
+    # Column-wise conversion straight from the DB-API tuples, no DataFrame in between
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_dictionary(field.type):
+            strings = pa.array(values, type=pa.string())
+            if field.metadata and b'enum_values' in field.metadata:
+                dictionary = pa.array(json.loads(field.metadata[b'enum_values']), type=pa.string())
+                indices = pc.index_in(strings, value_set=dictionary).cast(pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(strings.dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _open_writer(output_path, schema, export_format):
+    if export_format == 'arrow':
+        return pa.ipc.new_file(output_path, schema)
+    return pq.ParquetWriter(output_path, schema, compression=PARQUET_COMPRESSION)
+
+
+def _next_part_path(dataset_path, export_format):
+    # Appending to a single file isn't possible: turn it into a directory of part files
+    if os.path.isfile(dataset_path):
+        os.rename(dataset_path, dataset_path + '.tmp')
+        os.makedirs(dataset_path)
+        os.rename(dataset_path + '.tmp', os.path.join(dataset_path, f"part-00000.{export_format}"))
+    os.makedirs(dataset_path, exist_ok=True)
+    part = sum(1 for name in os.listdir(dataset_path) if name.startswith('part-'))
+    return os.path.join(dataset_path, f"part-{part:05d}.{export_format}")
+
+
+def export_table_to_columnar(engine, table, output_path=None, chunk_size=CHUNK_SIZE, total_rows=None,
+                             position=None, overall_bar=None, schema=None, export_format=None,
+                             query=None, params=None, append=False, row_filter=None):
+    """
+    Stream one table into a Parquet (or Arrow IPC) file, one row group per chunk.
+
+    Types come from the MySQL schema, not from pandas inference: INT -> int32,
+    DATE -> date32, ENUM -> dictionary-encoded string. Only one chunk is held in memory.
+    With append, the rows become a new part file of the {table}.{format} dataset.
+    Returns the number of rows written.
+    """
+    export_format = export_format or EXPORT_FORMAT
+    output_path = output_path or f"{table}.{export_format}"
+    if append and os.path.exists(output_path):
+        output_path = _next_part_path(output_path, export_format)
+    elif not append and os.path.isdir(output_path):
+        # A full export replaces a dataset that earlier incremental runs split into part files
+        shutil.rmtree(output_path)
+    if schema is None:
+        schema = table_schema(engine, table)
+    if total_rows is None:
+        total_rows = count_rows(engine, table)
+
+    rows_written = 0
+    with span(f"{export_format}_export", table=table, append=append) as table_span, \
+            engine.connect().execution_options(stream_results=True) as conn, \
+            tqdm(total=total_rows, desc=f"📤 {table}", unit='rows', unit_scale=True, colour='green',
+                 leave=False, position=position) as row_bar:
+        writer = _open_writer(output_path, schema, export_format)
+        try:
+            result = conn.execute(text(query or f"SELECT * FROM `{table}`"), params or {})
+            for rows in result.partitions(chunk_size):
+                row_bar.update(len(rows))
+                if overall_bar is not None:
+                    overall_bar.update(len(rows))
+                if row_filter is not None:
+                    keep = row_filter(pd.DataFrame.from_records(rows, columns=schema.names))
+                    rows = [row for row, kept in zip(rows, keep) if kept]
+                batch = rows_to_record_batch(rows, schema)
+                if export_format == 'arrow':
+                    writer.write_batch(batch)
+                else:
+                    writer.write_table(pa.Table.from_batches([batch]))
+                rows_written += len(rows)
+        finally:
+            # An empty table still gets a valid file with the schema
+            writer.close()
+        table_span.count('rows', rows_written)
+        table_span.count('bytes', os.path.getsize(output_path))
+    return rows_written
+
+
+def main():
+    engine = get_engine(EXPORT_WORKERS)
+    with engine.connect() as conn:
+        tables = [row[0] for row in conn.execute(text("SHOW TABLES"))]
+
+    print(f"\n{YELLOW}📊 Total tables found in database: {len(tables)}{RESET}")
+    print(f"{BLUE}📋 Table names:{RESET}")
+    for name in tables:
+        print(f" - {name}")
+
+    print(f"\n{YELLOW}📁 Starting export to {EXPORT_FORMAT} files...{RESET}\n")
+    start_run('script_to_parquet_from_sql', export_format=EXPORT_FORMAT, workers=EXPORT_WORKERS,
+              incremental=INCREMENTAL_EXPORT, tables=len(tables))
+    with span(f"{EXPORT_FORMAT}_export", workers=EXPORT_WORKERS):
+        if INCREMENTAL_EXPORT:
+            export_incremental(engine, tables, export_table_to_columnar, EXPORT_STATE_FILE, EXPORT_FORMAT)
+        elif EXPORT_WORKERS > 1:
+            export_tables_concurrently(engine, tables, EXPORT_WORKERS, export_fn=export_table_to_columnar,
+                                       extension=EXPORT_FORMAT)
+        else:
+            for i, table in enumerate(tqdm(tables, desc="Exporting Tables", unit="table", colour="blue")):
+                tqdm.write(f"{GREEN}📤 Exporting table {i+1}/{len(tables)}: {table}{RESET}")
+                try:
+                    rows = export_table_to_columnar(engine, table)
+                    tqdm.write(f"{GREEN}   ↳ {rows} rows written to {table}.{EXPORT_FORMAT}{RESET}")
+                except Exception as err:
+                    tqdm.write(f"{RED}❌ Error exporting {table}: {err}{RESET}")
+
+    engine.dispose()
+    finish_run('script_to_parquet_from_sql')
+    print(f"\n{GREEN}✅ Export completed. All tables written to {EXPORT_FORMAT}.{RESET}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+
+import mysql.connector
+from tqdm import tqdm
+
+from attendance_generator import write_attendance_rows, attendance_batches
+from dump_writer import DumpWriter
+from db_config import config_no_db
+from table_specs import TABLE_DDL, TABLE_COLUMNS, ddl_definitions
+
+# pyarrow is only needed by the Parquet sink
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from script_to_parquet_from_sql import arrow_type, rows_to_record_batch, ENUM_VALUE_PATTERN, \
+        PARQUET_COMPRESSION, CHUNK_SIZE as PARQUET_ROW_GROUP_ROWS
+except ImportError:
+    pq = None
+
+# Where generated rows can go. Every sink has a parent side (start / begin_table / add_shard /
+# end_table / finish / close, called in dump order) and a worker side: shard_writer() returns a
+# ShardWriter that receives one shard's rows in batches inside the process pool.
+#
+#   SqlDumpSink    INSERT dump for script_for_sql_loading.py (the classic company_database_full.sql)
+#   DelimitedSink  schema.sql + {table}.tsv (LOAD DATA) or {table}.csv (same layout as the CSV export)
+#   ParquetSink    {table}.parquet/part-NNNNN.parquet, typed from the DDL like the Parquet export
+#   DatabaseSink   batched parameterized INSERTs straight into MySQL, no text file at all
+
+# Rows handed to a ShardWriter per write_batch() call
+SINK_BATCH_ROWS = 10000
+
+# Read size when appending a finished shard file to the final output
+SHARD_COPY_BYTES = 16 * 1024 * 1024
+
+# Rows per executemany() in DatabaseSink (one commit per batch)
+DB_INSERT_BATCH_ROWS = 1000
+
+
+def _tsv_escape(value):
+    # LOAD DATA's default escaping: backslash, tab and newline are written as \\, \t and \n
+    if isinstance(value, str) and ('\\' in value or '\t' in value or '\n' in value):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return value
+
+
+def write_sql_rows(f, table, rows, batch_size=None, columns=None):
+    # Builds the text of the whole batch and hands it to f in one write() call
+    rows = list(rows)
+    if not rows:
+        return
+    header = f"INSERT INTO {table} ({', '.join(columns or TABLE_COLUMNS[table])}) VALUES"
+    # Column types never change within a table: ints bare, everything else quoted
+    template = "(" + ", ".join("{}" if isinstance(v, int) else "'{}'" for v in rows[0]) + ")"
+    if batch_size is None:
+        template = f"{header} {template};\n"
+        f.write("".join([template.format(*row) for row in rows]))
+        return
+    values = [template.format(*row) for row in rows]
+    f.write("".join([f"{header}\n" + ",\n".join(values[start:start + batch_size]) + ";\n"
+                     for start in range(0, len(values), batch_size)]))
+
+
+def write_tsv_rows(f, rows):
+    f.write("".join(["\t".join([str(_tsv_escape(v)) for v in row]) + "\n" for row in rows]))
+
+
+class ShardWriter:
+    """Worker side of a sink: receives the rows of one shard, batch by batch."""
+
+    def write_batch(self, rows):
+        raise NotImplementedError
+
+    def write_attendance(self, emp_ids, start_date, end_date, rng):
+        # Generic path: one batch per day; text sinks override it with the vectorized writer
+        for rows in attendance_batches(emp_ids, start_date, end_date, rng):
+            self.write_batch(rows)
+
+    def close(self):
+        # Whatever the parent's add_shard() needs (a file path, a row count, ...)
+        return None
+
+
+class Sink:
+    # True = employee/project ids are written explicitly (rows may arrive out of id order)
+    explicit_ids = False
+
+    def __init__(self):
+        # {table: {'rows', 'bytes'}} of everything added so far, for reports and benchmarks
+        self.table_stats = {}
+        self._digests = {}
+
+    def count(self, table, rows, nbytes=0):
+        stats = self.table_stats.setdefault(table, {'rows': 0, 'bytes': 0})
+        stats['rows'] += rows
+        stats['bytes'] += nbytes
+
+    def digest(self, table):
+        # sha256 over a table's row bytes (no DDL, headers or transaction lines)
+        return self._digests.setdefault(table, hashlib.sha256())
+
+    def checksums(self):
+        # {table: sha256 hex} for sinks that write row bytes; empty for Parquet / the database
+        return {table: digest.hexdigest() for table, digest in self._digests.items()}
+
+    def start(self, tables):
+        pass
+
+    def shard_writer(self, table, index, columns):
+        raise NotImplementedError
+
+    def begin_table(self, table, columns):
+        pass
+
+    def add_shard(self, table, result):
+        pass
+
+    def end_table(self, table):
+        pass
+
+    def finish(self):
+        pass
+
+    def close(self):
+        # Always called, also after an error
+        pass
+
+    def __getstate__(self):
+        # Sinks are pickled to the pool workers: leave open files and connections (_attrs) behind
+        return {key: value for key, value in self.__dict__.items() if not key.startswith('_')}
+
+
+class TextShardWriter(ShardWriter):
+    # One shard as a text file in the sink's shard_dir; the parent appends it to the table's output
+    def __init__(self, path, table, columns, row_format, batch_size=None):
+        self.path = path
+        self.table = table
+        self.columns = columns
+        self.row_format = row_format
+        self.batch_size = batch_size if row_format == 'sql' else None
+        self.pending = []
+        self.f = DumpWriter(path)
+
+    def write_batch(self, rows):
+        self.f.rows += len(rows)
+        if self.row_format == 'tsv':
+            write_tsv_rows(self.f, rows)
+        elif self.row_format == 'csv':
+            text = io.StringIO()
+            csv.writer(text, lineterminator='\n').writerows(rows)
+            self.f.write(text.getvalue())
+        elif self.batch_size is None:
+            write_sql_rows(self.f, self.table, rows, None, self.columns)
+        else:
+            # Carry the remainder over, so multi-row INSERTs stay batch_size rows across batches
+            self.pending.extend(rows)
+            full = len(self.pending) - len(self.pending) % self.batch_size
+            if full:
+                write_sql_rows(self.f, self.table, self.pending[:full], self.batch_size, self.columns)
+                del self.pending[:full]
+
+    def write_attendance(self, emp_ids, start_date, end_date, rng):
+        if self.row_format == 'csv':
+            super().write_attendance(emp_ids, start_date, end_date, rng)
+            return
+        self.f.rows += write_attendance_rows(self.f, emp_ids, start_date, end_date, rng=rng,
+                                             batch_size=self.batch_size, row_format=self.row_format,
+                                             progress=False)
+
+    def close(self):
+        if self.pending:
+            write_sql_rows(self.f, self.table, self.pending, self.batch_size, self.columns)
+        self.f.close()
+        return self.path, self.f.rows
+
+
+class SqlDumpSink(Sink):
+    """
+    One INSERT dump (CREATE DATABASE, then DDL + rows per table) for script_for_sql_loading.py.
+
+    batch_size=None writes one INSERT per row; a number writes multi-row INSERTs of that
+    many rows, one transaction per table with FK/unique checks off.
+    write_ddl=False (deltas) only writes `USE` and the INSERTs.
+    compression='gzip' / 'zstd' compresses the dump on the fly (see dump_writer.py).
+    """
+
+    def __init__(self, output_file, database, batch_size=None, write_ddl=True, compression=None):
+        super().__init__()
+        self.output_file = output_file
+        self.database = database
+        self.batch_size = batch_size
+        self.write_ddl = write_ddl
+        self.compression = compression
+        self.shard_dir = None
+
+    def start(self, tables):
+        output_dir = os.path.dirname(os.path.abspath(self.output_file))
+        self.shard_dir = tempfile.mkdtemp(prefix='hr_shards_', dir=output_dir)
+        self._file = DumpWriter(self.output_file, self.compression)
+        if self.write_ddl:
+            self._file.write(f"CREATE DATABASE IF NOT EXISTS {self.database};\n")
+        self._file.write(f"USE {self.database};\n\n")
+        if self.batch_size is not None:
+            self._file.write("SET FOREIGN_KEY_CHECKS=0;\nSET UNIQUE_CHECKS=0;\n\n")
+
+    def shard_writer(self, table, index, columns):
+        path = os.path.join(self.shard_dir, f"{table}_{index:05d}.sql")
+        return TextShardWriter(path, table, columns, 'sql', self.batch_size)
+
+    def begin_table(self, table, columns):
+        if self.write_ddl:
+            self._file.write(TABLE_DDL[table])
+        if self.batch_size is not None:
+            self._file.write("START TRANSACTION;\n")
+
+    def add_shard(self, table, result):
+        self.count(table, *_append_shard(self._file, *result, digest=self.digest(table)))
+
+    def end_table(self, table):
+        if self.batch_size is not None:
+            self._file.write("COMMIT;\n\n")
+
+    def finish(self):
+        if self.batch_size is not None:
+            self._file.write("SET FOREIGN_KEY_CHECKS=1;\nSET UNIQUE_CHECKS=1;\n")
+        self._file.close()
+        tqdm.write(self._file.report())
+
+    def close(self):
+        if getattr(self, '_file', None):
+            self._file.close()
+        if self.shard_dir:
+            shutil.rmtree(self.shard_dir, ignore_errors=True)
+
+
+class DelimitedSink(Sink):
+    """
+    output_dir/schema.sql (DDL only) plus one file per table with a header line of column names.
+
+    row_format='tsv' writes LOAD DATA's escaping for script_for_sql_loading.py's bulk mode;
+    'csv' writes standard quoted CSV, the same layout script_to_CSV_from_sql.py exports.
+    Department, employee and project ids are written, so child tables can be joined back.
+    """
+    explicit_ids = True
+
+    def __init__(self, output_dir, database, row_format='tsv', write_ddl=True):
+        super().__init__()
+        self.output_dir = output_dir
+        self.database = database
+        self.row_format = row_format
+        self.write_ddl = write_ddl
+        self.shard_dir = None
+
+    def start(self, tables):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.shard_dir = tempfile.mkdtemp(prefix='hr_shards_', dir=self.output_dir)
+        self._schema = open(os.path.join(self.output_dir, 'schema.sql'), 'w', encoding='utf-8')
+        if self.write_ddl:
+            self._schema.write(f"CREATE DATABASE IF NOT EXISTS {self.database};\n")
+        self._schema.write(f"USE {self.database};\n\n")
+        self._data = None
+
+    def shard_writer(self, table, index, columns):
+        path = os.path.join(self.shard_dir, f"{table}_{index:05d}.{self.row_format}")
+        return TextShardWriter(path, table, columns, self.row_format)
+
+    def begin_table(self, table, columns):
+        if self.write_ddl:
+            self._schema.write(TABLE_DDL[table])
+        self._data = DumpWriter(os.path.join(self.output_dir, f"{table}.{self.row_format}"))
+        separator = "\t" if self.row_format == 'tsv' else ","
+        self._data.write(separator.join(columns) + "\n")
+
+    def add_shard(self, table, result):
+        self.count(table, *_append_shard(self._data, *result, digest=self.digest(table)))
+
+    def end_table(self, table):
+        self._data.close()
+        tqdm.write(self._data.report())
+        self._data = None
+
+    def close(self):
+        for handle in (getattr(self, '_data', None), getattr(self, '_schema', None)):
+            if handle:
+                handle.close()
+        if self.shard_dir:
+            shutil.rmtree(self.shard_dir, ignore_errors=True)
+
+
+def _append_shard(writer, path, rows, digest=None):
+    # Shard files are already encoded: copy them in big binary chunks. Returns (rows, bytes).
+    nbytes = 0
+    with open(path, 'rb') as shard_file:
+        while True:
+            chunk = shard_file.read(SHARD_COPY_BYTES)
+            if not chunk:
+                break
+            writer.write_bytes(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            nbytes += len(chunk)
+    writer.rows += rows
+    os.remove(path)
+    return rows, nbytes
+
+
+COLUMN_DEF_PATTERN = re.compile(r"`?(\w+)`?\s+(\w+)(\([^)]*\))?")
+CONSTRAINT_WORDS = ('PRIMARY', 'FOREIGN', 'KEY', 'UNIQUE', 'INDEX', 'CONSTRAINT')
+
+
+def ddl_schema(table, columns):
+    """Arrow schema of the given columns, read from the table's CREATE TABLE in table_specs.py."""
+    fields = {}
+    for definition in ddl_definitions(TABLE_DDL[table]):
+        if definition.split(None, 1)[0].upper() in CONSTRAINT_WORDS:
+            continue
+        name, data_type, args = COLUMN_DEF_PATTERN.match(definition).groups()
+        column_type = data_type + (args or '')
+        metadata = None
+        if data_type.lower() == 'enum':
+            values = [value.replace("''", "'") for value in ENUM_VALUE_PATTERN.findall(column_type)]
+            metadata = {'enum_values': json.dumps(values)}
+        fields[name] = pa.field(name, arrow_type(data_type, column_type), metadata=metadata)
+    return pa.schema([fields[column] for column in columns])
+
+
+class ParquetShardWriter(ShardWriter):
+    # Each shard becomes its own part file; batches are regrouped into PARQUET_ROW_GROUP_ROWS row groups
+    def __init__(self, path, table, columns):
+        self.path = path
+        self.schema = ddl_schema(table, columns)
+        self.writer = pq.ParquetWriter(path, self.schema, compression=PARQUET_COMPRESSION)
+        self.pending = []
+        self.rows = 0
+
+    def write_batch(self, rows):
+        self.pending.extend(rows)
+        if len(self.pending) >= PARQUET_ROW_GROUP_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if self.pending:
+            batch = rows_to_record_batch(self.pending, self.schema)
+            self.writer.write_table(pa.Table.from_batches([batch]))
+            self.rows += len(self.pending)
+            self.pending = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+        return self.path, self.rows
+
+
+class ParquetSink(Sink):
+    """
+    One Parquet dataset per table: output_dir/{table}.parquet/part-NNNNN.parquet, one part per shard.
+    pd.read_parquet('{table}.parquet') reads it as one table, typed like script_to_parquet_from_sql.py.
+    Department, employee and project ids are written, as in the CSV / TSV files.
+    """
+    explicit_ids = True
+
+    def __init__(self, output_dir):
+        super().__init__()
+        if pq is None:
+            raise ImportError("The Parquet sink needs pyarrow (pip install pyarrow)")
+        self.output_dir = output_dir
+
+    def start(self, tables):
+        for table in tables:
+            dataset = os.path.join(self.output_dir, f"{table}.parquet")
+            shutil.rmtree(dataset, ignore_errors=True)
+            os.makedirs(dataset)
+
+    def shard_writer(self, table, index, columns):
+        path = os.path.join(self.output_dir, f"{table}.parquet", f"part-{index:05d}.parquet")
+        return ParquetShardWriter(path, table, columns)
+
+    def add_shard(self, table, result):
+        path, rows = result
+        self.count(table, rows, os.path.getsize(path))
+
+
+# One connection per pool process and database, reused by every shard the process runs
+_worker_connections = {}
+
+
+class DatabaseShardWriter(ShardWriter):
+    def __init__(self, database, table, columns, batch_rows):
+        conn = _worker_connections.get(database)
+        if conn is None or not conn.is_connected():
+            conn = _worker_connections[database] = mysql.connector.connect(**config_no_db, database=database)
+            cursor = conn.cursor()
+            # Shards of parents and children run at the same time
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0;")
+            cursor.execute("SET UNIQUE_CHECKS=0;")
+            cursor.close()
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.batch_rows = batch_rows
+        self.statement = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                          f"VALUES ({', '.join(['%s'] * len(columns))})")
+        self.rows = 0
+
+    def write_batch(self, rows):
+        # executemany() turns each slice into one multi-row INSERT; commit per slice
+        for start in range(0, len(rows), self.batch_rows):
+            self.cursor.executemany(self.statement, rows[start:start + self.batch_rows])
+            self.conn.commit()
+        self.rows += len(rows)
+
+    def close(self):
+        self.cursor.close()
+        return self.rows
+
+
+class DatabaseSink(Sink):
+    """
+    Insert the generated rows straight into MySQL, skipping the dump file and the loader.
+
+    Every shard inserts over its worker's own connection with batched, parameterized
+    INSERTs. Employee and project ids are explicit, since shards finish in any order.
+    write_ddl=True drops and recreates the database first; False (deltas) appends.
+    """
+    explicit_ids = True
+
+    def __init__(self, database, batch_rows=DB_INSERT_BATCH_ROWS, write_ddl=True):
+        super().__init__()
+        self.database = database
+        self.batch_rows = batch_rows
+        self.write_ddl = write_ddl
+
+    def start(self, tables):
+        if not self.write_ddl:
+            return
+        # Every table exists before the first shard runs, parents first
+        conn = mysql.connector.connect(**config_no_db)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS {self.database}")
+            cursor.execute(f"CREATE DATABASE {self.database}")
+            cursor.execute(f"USE {self.database}")
+            for table in tables:
+                cursor.execute(TABLE_DDL[table])
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+
+    def shard_writer(self, table, index, columns):
+        return DatabaseShardWriter(self.database, table, columns, self.batch_rows)
+
+    def add_shard(self, table, result):
+        self.count(table, result)
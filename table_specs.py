@@ -0,0 +1,373 @@
+from datetime import date, timedelta
+
+from attendance_generator import ATTENDANCE_STATUSES, ATTENDANCE_WEIGHTS
+
+# Declarative description of the eleven HR tables: DDL, FK parents, how many rows
+# (cardinality) and how every column value is drawn. parallel_generation.py is the
+# single engine that turns these specs into SQL or TSV at any scale.
+#
+# Column values are functions (ctx, row) -> value. ctx carries the shard's rng,
+# FakerPool, run params, the current parent id and item; row holds the columns
+# drawn so far, so later columns can depend on earlier ones. Columns are drawn in
+# the order listed, which is also the INSERT column order.
+#
+# Row kinds:
+#   list          one row per entry of 'values'
+#   range         one row per id of 'of' (employees / projects)
+#   per_employee  for every employee: 'count' rows, or one row per entry of 'each'
+#   daily         every employee on every attendance day (vectorized, see attendance_generator)
+# per_employee may add 'parent_values': drawn once per employee before its rows (payroll's base salary).
+
+departments = ['IT', 'HR', 'Finance', 'Marketing', 'Sales', 'Operations', 'R&D', 'Security']
+roles = ['Developer', 'Manager', 'Analyst', 'Lead', 'Executive']
+marital_status_options = ['Married', 'Single', 'Non-married']
+genders = ['Male', 'Female']
+statuses = ['Active', 'Completed', 'On Hold', 'Cancelled']
+leave_types = ['Casual', 'Sick', 'Paid', 'Unpaid']
+training_statuses = ['Completed', 'Ongoing', 'Not Started']
+training_courses = ['Python Basics', 'Project Management', 'Data Analysis', 'Leadership', 'Communication Skills']
+asset_types = ['Laptop', 'Mobile', 'Access Card', 'Monitor', 'Keyboard', 'Mouse', 'Mac']
+asset_statuses = ['Issued', 'Returned', 'Lost']
+benefits = ['Health Insurance', 'Stock Options', 'Paid Vacation', 'Gym Membership', 'Transport Allowance']
+leave_statuses = ['Approved', 'Rejected', 'Pending']
+
+
+def item():
+    # The list entry / sampled id / month this row is for
+    return lambda ctx, row: ctx.item
+
+
+def parent():
+    return lambda ctx, row: ctx.parent
+
+
+def parent_value(name):
+    return lambda ctx, row: ctx.parent_values[name]
+
+
+def randint(lo, hi):
+    return lambda ctx, row: ctx.rng.randint(lo, hi)
+
+
+def choice(options):
+    return lambda ctx, row: ctx.rng.choice(options)
+
+
+def weighted(options, weights):
+    return lambda ctx, row: ctx.rng.choices(options, weights=weights)[0]
+
+
+def fake(method):
+    # Faker text, made safe for the quoted SQL literal and one-line TSV
+    return lambda ctx, row: getattr(ctx.pool, method)().replace('\n', ', ').replace("'", "")
+
+
+def digits(min_len, max_len):
+    return lambda ctx, row: ''.join(str(ctx.rng.randint(0, 9)) for _ in range(ctx.rng.randint(min_len, max_len)))
+
+
+def date_between(start, end):
+    return lambda ctx, row: ctx.pool.date_between(start_date=start, end_date=end)
+
+
+def date_between_dates(start, end):
+    return lambda ctx, row: ctx.pool.date_between_dates(date_start=start, date_end=end)
+
+
+def date_until_reference(column):
+    # Between an earlier column and the run's reference "today"
+    return lambda ctx, row: ctx.pool.date_between_dates(date_start=row[column], date_end=ctx.params['reference_date'])
+
+
+def date_of_birth(age_column):
+    return lambda ctx, row: ctx.pool.date_of_birth(minimum_age=row[age_column], maximum_age=row[age_column])
+
+
+def days_after(column, lo, hi):
+    return lambda ctx, row: row[column] + timedelta(days=ctx.rng.randint(lo, hi))
+
+
+def derived(fn):
+    # No randomness: computed from the columns already drawn
+    return lambda ctx, row: fn(row)
+
+
+def sample_ids(count_param, lo, hi):
+    # 'each' for per_employee: lo..hi distinct ids out of 1..params[count_param]
+    return lambda ctx, row: ctx.rng.sample(range(1, ctx.params[count_param] + 1), ctx.rng.randint(lo, hi))
+
+
+def payroll_months():
+    return lambda ctx, row: ctx.params['months']
+
+
+def asset_name():
+    return lambda ctx, row: ctx.rng.choice(asset_types) + ' ' + ctx.pool.word().capitalize()
+
+
+def benefit_value(name_column):
+    def value(ctx, row):
+        if "Stock" in row[name_column]:
+            return f"{ctx.rng.randint(1, 100)} units"
+        return f"${ctx.rng.randint(100, 2000)}"
+    return value
+
+
+TABLE_SPECS = {
+    'departments': {
+        'ddl': "CREATE TABLE departments (department_id INT PRIMARY KEY AUTO_INCREMENT, department_name VARCHAR(50) UNIQUE);\n",
+        'parents': [],
+        'rows': {'kind': 'list', 'values': departments},
+        'id_column': 'department_id',
+        'columns': [
+            ('department_name', item()),
+        ],
+    },
+    'employees': {
+        'ddl': """
+CREATE TABLE employees (
+  empID INT PRIMARY KEY AUTO_INCREMENT,
+  employee_name VARCHAR(50),
+  age INT,
+  gender ENUM('Male', 'Female'),
+  date_of_birth DATE,
+  date_of_joining DATE,
+  role VARCHAR(50),
+  salary INT,
+  department_id INT,
+  address VARCHAR(100),
+  contact_number VARCHAR(12),
+  email_id VARCHAR(100),
+  marital_status ENUM('Married', 'Single', 'Non-married'),
+  FOREIGN KEY (department_id) REFERENCES departments(department_id)
+);\n""",
+        'parents': ['departments'],
+        'rows': {'kind': 'range', 'of': 'employees'},
+        'id_column': 'empID',
+        'columns': [
+            ('employee_name', fake('name')),
+            ('age', randint(25, 60)),
+            ('gender', choice(genders)),
+            ('date_of_birth', date_of_birth('age')),
+            ('date_of_joining', date_between('-10y', 'today')),
+            ('role', choice(roles)),
+            ('salary', randint(70000, 290000)),
+            ('department_id', randint(1, len(departments))),
+            ('address', fake('address')),
+            ('contact_number', digits(10, 12)),
+            ('email_id', fake('email')),
+            ('marital_status', choice(marital_status_options)),
+        ],
+    },
+    'projects': {
+        'ddl': """
+CREATE TABLE projects (
+  project_id INT PRIMARY KEY AUTO_INCREMENT,
+  project_name VARCHAR(100),
+  start_date DATE,
+  end_date DATE,
+  status ENUM('Active', 'Completed', 'On Hold', 'Cancelled'),
+  budget INT,
+  department_id INT,
+  FOREIGN KEY (department_id) REFERENCES departments(department_id)
+);\n""",
+        'parents': ['departments'],
+        'rows': {'kind': 'range', 'of': 'projects'},
+        'id_column': 'project_id',
+        'columns': [
+            ('project_name', fake('catch_phrase')),
+            ('start_date', date_between('-3y', '-6m')),
+            ('end_date', date_until_reference('start_date')),
+            ('status', choice(statuses)),
+            ('budget', randint(500000, 4000000)),
+            ('department_id', randint(1, len(departments))),
+        ],
+    },
+    'employee_project': {
+        'ddl': """
+CREATE TABLE employee_project (
+  empID INT,
+  project_id INT,
+  role_in_project VARCHAR(100),
+  assigned_date DATE,
+  PRIMARY KEY (empID, project_id),
+  FOREIGN KEY (empID) REFERENCES employees(empID),
+  FOREIGN KEY (project_id) REFERENCES projects(project_id)
+);\n""",
+        'parents': ['employees', 'projects'],
+        # 1-5 distinct projects per employee
+        'rows': {'kind': 'per_employee', 'each': sample_ids('num_projects', 1, 5)},
+        'columns': [
+            ('empID', parent()),
+            ('project_id', item()),
+            ('role_in_project', choice(roles)),
+            ('assigned_date', date_between('-2y', 'today')),
+        ],
+    },
+    'attendance': {
+        'ddl': """
+CREATE TABLE attendance (
+  attendance_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  date DATE,
+  status ENUM('Present', 'Absent', 'Half Day', 'Leave'),
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        # Every employee, every day: written by the vectorized attendance_generator
+        'rows': {'kind': 'daily'},
+        'columns': [
+            ('empID', parent()),
+            ('date', item()),
+            ('status', weighted(ATTENDANCE_STATUSES, ATTENDANCE_WEIGHTS)),
+        ],
+    },
+    'bonuses': {
+        'ddl': """
+CREATE TABLE bonuses (
+  bonus_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  hours_overtime INT,
+  bonus_amount INT,
+  bonus_date DATE,
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        'rows': {'kind': 'per_employee', 'count': randint(0, 3)},
+        'columns': [
+            ('empID', parent()),
+            ('hours_overtime', randint(1, 10)),
+            ('bonus_amount', derived(lambda row: row['hours_overtime'] * 1000)),
+            ('bonus_date', date_between('-1y', 'today')),
+        ],
+    },
+    'payroll': {
+        'ddl': """
+CREATE TABLE payroll (
+  payroll_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  month VARCHAR(20),
+  base_salary INT,
+  bonus_paid INT,
+  deductions INT,
+  net_salary INT,
+  payment_date DATE,
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        # One row per payroll month; the base salary is drawn once per employee
+        'rows': {'kind': 'per_employee', 'each': payroll_months(), 'parent_values': {'base_salary': randint(70000, 290000)}},
+        'columns': [
+            ('empID', parent()),
+            ('month', item()),
+            ('base_salary', parent_value('base_salary')),
+            ('bonus_paid', choice([0, 1000, 2000, 3000])),
+            ('deductions', randint(0, 2000)),
+            ('net_salary', derived(lambda row: row['base_salary'] + row['bonus_paid'] - row['deductions'])),
+            ('payment_date', date_between_dates(date(2022, 1, 1), date(2025, 12, 31))),
+        ],
+    },
+    'leaves': {
+        'ddl': """
+CREATE TABLE leaves (
+  leave_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  leave_type ENUM('Casual', 'Sick', 'Paid', 'Unpaid'),
+  start_date DATE,
+  end_date DATE,
+  status ENUM('Approved', 'Rejected', 'Pending'),
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        'rows': {'kind': 'per_employee', 'count': randint(0, 4)},
+        'columns': [
+            ('empID', parent()),
+            ('leave_type', choice(leave_types)),
+            ('start_date', date_between('-1y', 'today')),
+            ('end_date', days_after('start_date', 1, 10)),
+            ('status', choice(leave_statuses)),
+        ],
+    },
+    'training': {
+        'ddl': """
+CREATE TABLE training (
+  training_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  training_name VARCHAR(100),
+  start_date DATE,
+  end_date DATE,
+  status ENUM('Completed', 'Ongoing', 'Not Started'),
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        'rows': {'kind': 'per_employee', 'count': randint(0, 2)},
+        'columns': [
+            ('empID', parent()),
+            ('training_name', choice(training_courses)),
+            ('start_date', date_between('-2y', '-6m')),
+            ('end_date', days_after('start_date', 5, 30)),
+            ('status', choice(training_statuses)),
+        ],
+    },
+    'assets': {
+        'ddl': """
+CREATE TABLE assets (
+  asset_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  asset_name VARCHAR(100),
+  asset_type VARCHAR(50),
+  purchase_date DATE,
+  status ENUM('Issued', 'Returned', 'Lost'),
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        'rows': {'kind': 'per_employee', 'count': randint(0, 3)},
+        'columns': [
+            ('empID', parent()),
+            ('asset_name', asset_name()),
+            ('asset_type', choice(asset_types)),
+            ('purchase_date', date_between('-3y', 'today')),
+            ('status', choice(asset_statuses)),
+        ],
+    },
+    'employee_benefits': {
+        'ddl': """
+CREATE TABLE employee_benefits (
+  benefit_id INT PRIMARY KEY AUTO_INCREMENT,
+  empID INT,
+  benefit_name VARCHAR(100),
+  benefit_value VARCHAR(100),
+  FOREIGN KEY (empID) REFERENCES employees(empID)
+);\n""",
+        'parents': ['employees'],
+        'rows': {'kind': 'per_employee', 'count': randint(0, 3)},
+        'columns': [
+            ('empID', parent()),
+            ('benefit_name', choice(benefits)),
+            ('benefit_value', benefit_value('benefit_name')),
+        ],
+    },
+}
+
+# Derived views used by the writers and loaders
+TABLE_DDL = {table: spec['ddl'] for table, spec in TABLE_SPECS.items()}
+TABLE_COLUMNS = {table: [column for column, _ in spec['columns']] for table, spec in TABLE_SPECS.items()}
+# AUTO_INCREMENT ids that delta dumps write explicitly, so FKs never depend on the server's counter
+ID_COLUMNS = {table: spec['id_column'] for table, spec in TABLE_SPECS.items() if 'id_column' in spec}
+
+
+def ddl_definitions(ddl):
+    # Column and constraint definitions of a CREATE TABLE, split on the commas between them
+    # (not the ones inside ENUM(...) / DECIMAL(...))
+    body = ddl[ddl.index('(') + 1:ddl.rindex(')')]
+    definitions, depth, current = [], 0, ''
+    for char in body:
+        depth += char == '('
+        depth -= char == ')'
+        if char == ',' and depth == 0:
+            definitions.append(current.strip())
+            current = ''
+        else:
+            current += char
+    definitions.append(current.strip())
+    return [definition for definition in definitions if definition]
@@ -0,0 +1,142 @@
+import re
+from datetime import date, timedelta
+
+import numpy as np
+
+# Distinct values pre-generated per Faker method. Bigger pools mean more unique
+# names/addresses at the cost of a longer warm-up; 0 calls Faker for every row.
+FAKER_POOL_SIZE = 5000
+
+# How many pool indexes / uniforms are drawn per vectorized NumPy call
+BLOCK_SIZE = 65536
+
+POOLED_METHODS = ['name', 'address', 'email', 'catch_phrase', 'word']
+
+# Faker's relative date strings ('-10y', '+3M', '-2w', ...), read with Faker's rules so the
+# dates stay the same: a year is 365.24 days, a month (M) 30.42 days, and 'm' means minutes
+RELATIVE_DATE_PATTERN = re.compile(r'([-+]\d+)([yMwdhms])')
+RELATIVE_DATE_UNITS = {'y': 'years', 'M': 'months', 'w': 'weeks', 'd': 'days', 'h': 'hours',
+                       'm': 'minutes', 's': 'seconds'}
+
+
+def relative_timedelta(value):
+    # '-10y' -> timedelta(days=-3652.4); several parts ('-1y-2M') add up
+    parts = RELATIVE_DATE_PATTERN.findall(value)
+    if not parts or ''.join(amount + unit for amount, unit in parts) != value:
+        raise ValueError(f"Can't parse date string {value!r}")
+    params = {RELATIVE_DATE_UNITS[unit]: int(amount) for amount, unit in parts}
+    days = params.pop('days', 0)
+    if 'years' in params:
+        days += 365.24 * params.pop('years')
+    if 'months' in params:
+        days += 30.42 * params.pop('months')
+    return timedelta(days=days, **params)
+
+
+def _change_year(day, years):
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:  # Feb 29 -> Feb 28
+        return day.replace(year=day.year + years, day=28)
+
+
+class FakerPool:
+    """
+    Drop-in replacement for the hot Faker calls in the generators.
+
+    name()/address()/email()/catch_phrase()/word() sample from pools that are
+    generated once, using blocks of NumPy-drawn indexes. date_between() and
+    friends turn '-10y' / 'today' into integer day bounds once per distinct
+    pair and then only pick an offset, instead of re-parsing on every call.
+    """
+
+    def __init__(self, fake, pool_size=FAKER_POOL_SIZE, rng=None, today=None):
+        self.fake = fake
+        self.pool_size = pool_size
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.today = today or date.today()
+        self.pools = {}
+        self._streams = {}
+        self._date_bounds = {}
+        self._uniforms = self._uniform_stream()
+
+    def pregenerate(self, methods=POOLED_METHODS):
+        for method in methods:
+            self.pool(method)
+        return self
+
+    def pool(self, method):
+        values = self.pools.get(method)
+        if values is None:
+            faker_method = getattr(self.fake, method)
+            values = np.array([faker_method() for _ in range(self.pool_size)], dtype=object)
+            self.pools[method] = values
+        return values
+
+    def sample(self, method, n):
+        # Vectorized: n values from the pool in one indexing operation
+        values = self.pool(method)
+        return values[self.rng.integers(0, len(values), n)]
+
+    def _value_stream(self, method):
+        while True:
+            yield from self.sample(method, BLOCK_SIZE).tolist()
+
+    def _uniform_stream(self):
+        while True:
+            yield from self.rng.random(BLOCK_SIZE).tolist()
+
+    def _next(self, method):
+        if not self.pool_size:
+            return getattr(self.fake, method)()
+        stream = self._streams.get(method)
+        if stream is None:
+            stream = self._streams[method] = self._value_stream(method)
+        return next(stream)
+
+    def name(self):
+        return self._next('name')
+
+    def address(self):
+        return self._next('address')
+
+    def email(self):
+        return self._next('email')
+
+    def catch_phrase(self):
+        return self._next('catch_phrase')
+
+    def word(self):
+        return self._next('word')
+
+    def _parse_date(self, value):
+        # Faker's date-string rules (see relative_timedelta), but relative to self.today
+        if isinstance(value, date):
+            return value
+        if value in ('today', 'now'):
+            return self.today
+        return self.today + relative_timedelta(value)
+
+    def date_between(self, start_date='-30y', end_date='today'):
+        bounds = self._date_bounds.get((start_date, end_date))
+        if bounds is None:
+            start = self._parse_date(start_date).toordinal()
+            end = self._parse_date(end_date).toordinal()
+            bounds = self._date_bounds[(start_date, end_date)] = (start, end - start + 1)
+        start, span = bounds
+        return date.fromordinal(start + int(next(self._uniforms) * span))
+
+    def date_between_dates(self, date_start, date_end):
+        start = date_start.toordinal()
+        return date.fromordinal(start + int(next(self._uniforms) * (date_end.toordinal() - start + 1)))
+
+    def date_of_birth(self, minimum_age=0, maximum_age=115):
+        key = ('dob', minimum_age, maximum_age)
+        bounds = self._date_bounds.get(key)
+        if bounds is None:
+            # Same window as Faker: born after (today - max_age - 1 years), up to (today - min_age years)
+            start = _change_year(self.today, -(maximum_age + 1)).toordinal() + 1
+            end = _change_year(self.today, -minimum_age).toordinal()
+            bounds = self._date_bounds[key] = (start, end - start + 1)
+        start, span = bounds
+        return date.fromordinal(start + int(next(self._uniforms) * span))